@@ -1,5 +1,18 @@
+import argparse
+import asyncio
+import cProfile
+import json
+import sys
+import threading
+import time
 import requests
-from difflib import get_close_matches
+import pokeapi_compare
+from pokeapi_async import BatchResolver, resolve_batch
+from pokeapi_evolution import flatten_chain
+import pokeapi_mirror
+import pokeapi_names
+import pokeapi_suggest
+import pokeapi_trace
 from rich import print
 from rich.console import Console
 from rich.table import Table
@@ -7,30 +20,23 @@ from rich.panel import Panel
 
 console = Console()
 
-# Función para manejar peticiones HTTP con manejo de errores
-def fetch_data(url):
+# Función para obtener nombres de Pokémon desde la PokéAPI
+def get_all_pokemon_names():
+    # Se recorre la lista paginada en lugar de pedir limit=10000 de una vez
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return list(pokeapi_names.iter_pokemon_names())
     except requests.exceptions.RequestException as e:
         console.print(f"[red]Error al realizar la petición: {e}[/red]")
-        return None
-
-# Función para obtener nombres de Pokémon desde la PokéAPI
-def get_all_pokemon_names():
-    url = "https://pokeapi.co/api/v2/pokemon?limit=10000"
-    data = fetch_data(url)
-    if data:
-        return [pokemon["name"] for pokemon in data["results"]]
-    return []
+        return []
 
 # Función para sugerir nombres en caso de error
+@pokeapi_trace.traced("suggest_names")
 def suggest_names(name, all_names):
-    suggestions = get_close_matches(name, all_names, n=5, cutoff=0.6)
+    suggestions = pokeapi_suggest.suggest(name, all_names, n=5, cutoff=0.6)
     return suggestions
 
 # Función para mostrar información del Pokémon
+@pokeapi_trace.traced("display_pokemon_info")
 def display_pokemon_info(data):
     table = Table(title=f"[bold green]{data['name'].capitalize()}[/bold green]", title_style="bold cyan")
     table.add_column("Atributo", style="bold magenta")
@@ -45,24 +51,22 @@ def display_pokemon_info(data):
     console.print(table)
 
 # Función para mostrar la cadena de evolución
+@pokeapi_trace.traced("display_evolution_chain")
 def display_evolution_chain(chain):
-    evolution_text = []
-
-    def get_evolves(evolution):
-        evolution_text.append(f"[bold cyan]- {evolution['species']['name'].capitalize()}[/bold cyan]")
-        for evolves_to in evolution.get('evolves_to', []):
-            get_evolves(evolves_to)
-
-    get_evolves(chain)
+    evolution_text = [
+        f"[bold cyan]- {name.capitalize()}[/bold cyan]" for name, depth in flatten_chain(chain)
+    ]
     console.print(Panel("\n".join(evolution_text), title="[magenta]Cadena de Evolución[/magenta]", expand=False))
 
 # Función principal para obtener información básica del Pokémon
 def get_pokemon_info(pokemon, all_names):
     console.print(f"\n[cyan]Buscando información sobre '{pokemon}'...[/cyan]\n")
-    base_url = f"https://pokeapi.co/api/v2/pokemon/{pokemon}/"
-    data = fetch_data(base_url)
+    # Primero la copia local (sin red); si no está, pokémon y especie se piden a la vez
+    result = pokeapi_mirror.lookup(pokemon) or resolve_batch([pokemon])[0]
+    data = result["pokemon"]
 
     if not data:
+        console.print(f"[red]Error al realizar la petición: {result['error']}[/red]")
         suggestions = suggest_names(pokemon, all_names)
         if suggestions:
             console.print("\n[bold yellow]¿Quisiste decir?[/bold yellow]")
@@ -80,19 +84,162 @@ def get_pokemon_info(pokemon, all_names):
     # Mostrar información básica
     display_pokemon_info(data)
 
-    # Obtener y mostrar cadena de evolución
-    species_url = f"https://pokeapi.co/api/v2/pokemon-species/{pokemon}/"
-    species_data = fetch_data(species_url)
+    # Mostrar cadena de evolución
+    if result["evolution_chain"]:
+        display_evolution_chain(result["evolution_chain"]["chain"])
+
+# Función para mostrar varios Pokémon en una tabla comparativa
+def display_comparison(rows, missing, sort_key="id", reverse=False):
+    table = Table(title=f"[bold green]Comparación ({len(rows)} Pokémon)[/bold green]", title_style="bold cyan")
+    for key, title in pokeapi_compare.COLUMNS:
+        numeric = key in ("id", "weight", "height")
+        table.add_column(title, style="bold yellow" if numeric else "bold magenta", justify="right" if numeric else "left")
+    for row in pokeapi_compare.sort_rows(rows, sort_key, reverse):
+        table.add_row(*(str(row[key]) for key, _ in pokeapi_compare.COLUMNS))
+    console.print(table)
+    if missing:
+        console.print(f"[yellow]No encontrados: {', '.join(missing)}[/yellow]")
+
+# Función para cargar y comparar una selección (type:fire, gen:1 o lista de nombres)
+def compare_pokemon(selection, sort_key="id", reverse=False, concurrency=20):
+    console.print(f"\n[cyan]Cargando '{selection}'...[/cyan]\n")
+    try:
+        queries = pokeapi_compare.selection_queries(selection)
+    except requests.exceptions.RequestException as e:
+        console.print(f"[red]Error al realizar la petición: {e}[/red]")
+        return
+    rows, missing = pokeapi_compare.load_rows(queries, concurrency)
+    display_comparison(rows, missing, sort_key, reverse)
+
+# Función para mostrar el desglose de tiempos registrado con --profile
+def display_profile(elapsed):
+    table = Table(title=f"[bold green]Desglose de la búsqueda ({elapsed * 1000:.1f} ms)[/bold green]")
+    table.add_column("Tramo", style="bold magenta")
+    table.add_column("Llamadas", justify="right")
+    table.add_column("Total ms", justify="right", style="bold yellow")
+    table.add_column("Máx ms", justify="right")
+    table.add_column("Bytes", justify="right")
+    for name, entry in pokeapi_trace.summary().items():
+        table.add_row(name, str(entry["calls"]), f"{entry['total_ms']:.2f}", f"{entry['max_ms']:.2f}", str(entry["bytes"]))
+    console.print(table)
+
+# Función para ejecutar una tarea con trazas y, opcionalmente, guardar cProfile y la traza
+def run_profiled(task, dump_prefix=None):
+    pokeapi_trace.reset()
+    profiler = cProfile.Profile() if dump_prefix else None
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        task()
+    finally:
+        if profiler:
+            profiler.disable()
+        display_profile(time.perf_counter() - started)
+        if dump_prefix:
+            profiler.dump_stats(f"{dump_prefix}.pstats")
+            pokeapi_trace.write_chrome_trace(f"{dump_prefix}.trace.json")
+            console.print(f"[dim]Perfil guardado en {dump_prefix}.pstats y {dump_prefix}.trace.json[/dim]")
+
+# Función para leer consultas de un fichero: un nombre/ID por línea o JSONL
+def read_queries(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError:
+            value = line
+        if isinstance(value, dict):
+            value = value.get("name") or value.get("id") or value.get("query")
+        if value is not None and str(value).strip():
+            yield str(value).strip().lower()
+
+# Función para convertir un resultado en un registro JSON compacto
+def batch_record(result, all_names):
+    data = result["pokemon"]
+    if not data:
+        return {
+            "query": result["query"],
+            "found": False,
+            "error": str(result["error"]) if result["error"] else None,
+            "suggestions": suggest_names(result["query"], all_names),
+        }
+    chain = result["evolution_chain"]
+    return {
+        "query": result["query"],
+        "found": True,
+        "id": data["id"],
+        "name": data["name"],
+        "weight": data["weight"],
+        "height": data["height"],
+        "types": [t["type"]["name"] for t in data["types"]],
+        "evolution_chain": [
+            {"name": name, "depth": depth} for name, depth in flatten_chain(chain["chain"])
+        ] if chain else [],
+    }
+
+# Función para escribir un registro por línea a medida que llegan
+# (el lector de la entrada también escribe los aciertos locales desde su hilo)
+_write_lock = threading.Lock()
+
+def write_record(record):
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _write_lock:
+        sys.stdout.write(line)
+        sys.stdout.flush()
 
-    if species_data and 'evolution_chain' in species_data:
-        evolution_chain_url = species_data['evolution_chain']['url']
-        evolution_data = fetch_data(evolution_chain_url)
+# Función principal del modo por lotes: JSONL de entrada, JSONL de salida
+async def run_batch(queries, all_names, concurrency=10):
+    def remote_queries():
+        # Lo que ya está en la copia local se responde sin esperar a la red
+        for query in queries:
+            local = pokeapi_mirror.lookup(query)
+            if local:
+                write_record(batch_record(local, all_names))
+            else:
+                yield query
 
-        if evolution_data:
-            display_evolution_chain(evolution_data['chain'])
+    resolver = BatchResolver(concurrency)
+    async for result in resolver.resolve_stream(remote_queries()):
+        write_record(batch_record(result, all_names))
 
 # Main: Solicitar entrada al usuario con una interfaz interactiva
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PokéDex en consola.")
+    parser.add_argument("--batch", metavar="FICHERO", help="modo por lotes: nombres o JSONL desde un fichero ('-' para stdin)")
+    parser.add_argument("--concurrency", type=int, default=10, help="consultas simultáneas en modo por lotes")
+    parser.add_argument("--compare", metavar="SELECCIÓN", help="tabla comparativa: type:fire, gen:1 o 'pikachu,eevee,25'")
+    parser.add_argument("--sort", default="id", choices=[key for key, _ in pokeapi_compare.COLUMNS], help="columna de orden en --compare")
+    parser.add_argument("--desc", action="store_true", help="orden descendente en --compare")
+    parser.add_argument("--profile", action="store_true", help="mostrar el desglose de tiempos de cada búsqueda")
+    parser.add_argument("--profile-dump", metavar="PREFIJO", help="con --profile, guardar cProfile (.pstats) y la traza (.trace.json)")
+    args = parser.parse_args()
+    if args.profile:
+        pokeapi_trace.enable()
+
+    if args.compare:
+        task = lambda: compare_pokemon(args.compare, args.sort, args.desc, max(args.concurrency, 20))
+        if args.profile:
+            run_profiled(task, args.profile_dump)
+        else:
+            task()
+        sys.exit(0)
+
+    if args.batch:
+        # Los mensajes van a stderr para que stdout sea JSONL limpio
+        console = Console(stderr=True)
+        all_names = pokeapi_names.load_snapshot() or get_all_pokemon_names()
+        stream = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+        with stream:
+            task = lambda: asyncio.run(run_batch(read_queries(stream), all_names, args.concurrency))
+            if args.profile:
+                run_profiled(task, args.profile_dump)
+            else:
+                task()
+        sys.exit(0)
+
     console.print("[bold magenta]Cargando lista de Pokémon, por favor espera...[/bold magenta]\n")
     all_names = get_all_pokemon_names()
 
@@ -104,4 +251,8 @@ if __name__ == "__main__":
             if pokemon == "salir":
                 console.print("[bold green]¡Gracias por usar el programa! Hasta luego.[/bold green]")
                 break
-            get_pokemon_info(pokemon, all_names)
+            if args.profile:
+                dump_prefix = f"{args.profile_dump}-{pokemon}" if args.profile_dump else None
+                run_profiled(lambda: get_pokemon_info(pokemon, all_names), dump_prefix)
+            else:
+                get_pokemon_info(pokemon, all_names)
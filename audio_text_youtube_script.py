@@ -1,121 +1,180 @@
+import argparse
+import functools
+import json
 import os
 import re
 import yt_dlp
-import subprocess
-import wave
-import whisper
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from transformers import pipeline
-from googletrans import Translator
-import speech_recognition as sr
+import yt_audio
+import yt_cache
+import yt_keywords
+import yt_metrics
+import yt_models
+import yt_pipeline
+import yt_transcribe
+import yt_translate
 
 # --- Configuración ---
 output_folder = "output"
+whisper_model = "base"
+target_language = "es"
+# Resumen del curso que genera web_course_analysis_tool.py (también entra en el corpus de palabras clave)
+course_summary_file = "course_summary.md"
+# Audios más largos que esto se transcriben por tramos en paralelo
+parallel_threshold_s = 120
+# Resumen: trozos por pasada del modelo e hilos de CPU (None = los que decida PyTorch)
+summary_batch_size = 4
+summary_threads = None
 os.makedirs(output_folder, exist_ok=True)
 
 # --- Funciones ---
-def check_audio_properties(wav_path):
-    """Verifica las propiedades del archivo de audio WAV."""
-    try:
-        with wave.open(wav_path, 'rb') as wav_file:
-            params = wav_file.getparams()
-            print(f"Propiedades del audio: {params}")
-            return params
-    except Exception as e:
-        raise RuntimeError(f"Error al verificar las propiedades del audio: {str(e)}")
+def clean_title(title):
+    """Título apto para nombre de fichero."""
+    return re.sub(r'[<>:"/\\|?*]', '', title)[:100]  # Limitar longitud
+
+def video_key(url):
+    """Identificador estable de un video: su ID de YouTube o, si no lo tiene, la URL."""
+    match = re.search(r'(?:v=|youtu\.be/|shorts/|embed/)([\w-]{11})', url)
+    return match.group(1) if match else url
 
+@yt_metrics.instrumented("download_audio", bytes_out=lambda result: yt_metrics.file_size(result[0]))
 def download_audio(youtube_url):
-    """Descarga el audio de un video de YouTube."""
+    """Descarga el audio de un video de YouTube (o reutiliza el ya descargado)."""
+    cache = yt_cache.default_cache()
+    key = yt_cache.artifact_key("descarga", source=video_key(youtube_url))
+    meta_key = yt_cache.artifact_key("descarga-meta", source=video_key(youtube_url))
+    cached_path, meta = cache.get_file(key), cache.get_json(meta_key)
+    if cached_path and meta:
+        print("(descarga: usando el audio guardado)")
+        return cached_path, meta['title']
     try:
         ydl_opts = {
             'format': 'bestaudio/best',
-            'outtmpl': 'output/%(title)s.%(ext)s',
+            # Por ID: con varias descargas en paralelo, dos videos con el mismo título no se pisan
+            'outtmpl': 'output/%(id)s.%(ext)s',
+            'noplaylist': True,
         }
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info_dict = ydl.extract_info(youtube_url, download=True)
-            audio_path = ydl.prepare_filename(info_dict)
-            return audio_path, info_dict.get('title', 'Título desconocido')
+            title = info_dict.get('title', 'Título desconocido')
+            audio_path = cache.put_file(key, ydl.prepare_filename(info_dict), "descarga", move=True)
+            cache.put_json(meta_key, {"title": title, "url": youtube_url}, "descarga")
+            return audio_path, title
     except Exception as e:
         raise RuntimeError(f"Error al descargar el audio: {str(e)}")
 
-def convert_to_mp3(audio_path):
-    """Convierte un archivo de audio al formato MP3."""
+@yt_metrics.instrumented("decode_audio", yt_metrics.file_size, yt_metrics.audio_size)
+def decode_audio(audio_path, mp3_path=None):
+    """Decodifica el audio a 16 kHz mono en memoria, con una sola pasada de ffmpeg."""
     try:
-        mp3_path = audio_path.rsplit(".", 1)[0] + ".mp3"
-        subprocess.run(['ffmpeg', '-i', audio_path, '-vn', '-acodec', 'libmp3lame', '-ab', '192k', mp3_path], check=True)
-        return mp3_path
-    except subprocess.CalledProcessError:
-        raise RuntimeError("Error al convertir el archivo a MP3.")
-
-def convert_to_wav(mp3_path):
-    """Convierte un archivo MP3 al formato WAV con las propiedades adecuadas."""
+        samples = yt_audio.decode_audio(audio_path, mp3_path=mp3_path)
+        print(f"Audio decodificado: {yt_audio.duration(samples):.1f} s a {yt_audio.SAMPLE_RATE} Hz")
+        return samples
+    except (OSError, RuntimeError) as e:
+        raise RuntimeError(f"Error al decodificar el audio: {str(e)}")
+
+@yt_metrics.instrumented("transcribe_with_whisper", yt_metrics.audio_size, yt_metrics.text_size)
+def transcribe_with_whisper(audio):
+    """Transcribe el audio (ruta o muestras de 16 kHz) usando Whisper."""
     try:
-        wav_path = mp3_path.rsplit(".", 1)[0] + ".wav"
-        subprocess.run(['ffmpeg', '-i', mp3_path, '-ar', '16000', '-ac', '1', wav_path], check=True)
-        if not os.path.exists(wav_path):
-            raise FileNotFoundError(f"El archivo WAV no se creó correctamente: {wav_path}")
-        check_audio_properties(wav_path)
-        return wav_path
-    except subprocess.CalledProcessError:
-        raise RuntimeError("Error al convertir el archivo a WAV.")
-
-def transcribe_with_whisper(audio_path):
-    """Transcribe el audio usando Whisper."""
+        # El modelo se carga una sola vez (en este proceso o en el servidor de yt_models.py)
+        return yt_models.transcribe(audio, model=whisper_model)
+    except Exception as e:
+        raise RuntimeError(f"Error al transcribir con Whisper: {str(e)}")
+
+@yt_metrics.instrumented("transcribe_long", yt_metrics.audio_size, yt_metrics.text_size)
+def transcribe_long(samples, audio_path, title=None, workers=None):
+    """Transcribe un audio largo por tramos de voz en paralelo.
+
+    El texto parcial se va escribiendo en output/ y el progreso se guarda,
+    así que si el proceso se interrumpe solo se repiten los tramos que faltaban.
+    """
+    base = os.path.join(output_folder, clean_title(title or os.path.basename(audio_path).rsplit(".", 1)[0]))
+    progress_path = base + ".segments.jsonl"
+    partial_path = base + ".partial.md"
     try:
-        model = whisper.load_model("base")
-        result = model.transcribe(audio_path)
-        return result['text']
+        result = yt_transcribe.transcribe_parallel(
+            samples,
+            model=whisper_model,
+            workers=workers,
+            progress_path=progress_path,
+            partial_path=partial_path,
+            title=title,
+            on_segment=lambda entry, done, total: print(f"Tramo {done}/{total} transcrito"),
+        )
     except Exception as e:
         raise RuntimeError(f"Error al transcribir con Whisper: {str(e)}")
+    for path in (progress_path, partial_path):
+        if os.path.exists(path):
+            os.remove(path)
+    return result['text']
 
+@yt_metrics.instrumented("transcribe_audio", yt_metrics.file_size, yt_metrics.text_size)
 def transcribe_audio(audio_path):
-    """Transcribe el audio usando Google Speech Recognition como respaldo."""
-    recognizer = sr.Recognizer()
+    """Transcribe el audio usando Google Speech Recognition como respaldo.
+
+    El WAV se lee por ventanas solapadas que se reconocen por separado, así
+    que la memoria no depende de la duración del audio.
+    """
     try:
-        with sr.AudioFile(audio_path) as source:
-            audio = recognizer.record(source)
-        text = recognizer.recognize_google(audio)
-        return text
-    except sr.UnknownValueError:
-        return "Error: No se pudo entender el audio (sin contenido comprensible)."
-    except sr.RequestError as e:
-        return f"Error: Problema con la solicitud de reconocimiento de voz: {str(e)}"
+        text, errors = yt_transcribe.transcribe_wav_streaming(audio_path)
     except Exception as e:
         return f"Error inesperado al transcribir audio: {str(e)}"
+    if errors:
+        print(f"{len(errors)} ventanas no se pudieron reconocer; la primera: {errors[0]}")
+    if not text:
+        if errors:
+            return f"Error: Problema con la solicitud de reconocimiento de voz: {errors[0]}"
+        return "Error: No se pudo entender el audio (sin contenido comprensible)."
+    return text
 
+@yt_metrics.instrumented("translate_text", yt_metrics.text_size, yt_metrics.text_size)
 def translate_text(text, target_language="es"):
-    """Traduce el texto al idioma deseado."""
+    """Traduce el texto al idioma deseado.
+
+    Se traduce por lotes de frases en paralelo con un cliente compartido, y
+    las frases ya traducidas en otras ejecuciones se toman de la memoria.
+    """
     try:
-        translator = Translator()
-        translation = translator.translate(text, dest=target_language)
-        return translation.text
+        return yt_translate.default_translator().translate(text, dest=target_language)
     except Exception as e:
         return f"Error al traducir texto: {str(e)}"
 
-def summarize_text(text):
-    """Resume el texto utilizando un modelo de IA."""
+@yt_metrics.instrumented("summarize_text", yt_metrics.text_size, yt_metrics.text_size)
+def summarize_text(text, batch_size=None, threads=None):
+    """Resume el texto utilizando un modelo de IA.
+
+    Los textos largos se parten en trozos que caben en el modelo, se resumen
+    por lotes y después se resumen los resúmenes.
+    """
     try:
-        summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
-        max_len = min(len(text.split()) + 20, 150)
-        return summarizer(text, max_length=max_len, min_length=20, do_sample=False)[0]['summary_text']
+        return yt_models.summarize_long(
+            text, batch_size=batch_size or summary_batch_size, threads=threads or summary_threads
+        )
     except Exception as e:
         return f"Error al resumir texto: {str(e)}"
 
+_keyword_index_synced = False
+
+@yt_metrics.instrumented("extract_keywords", yt_metrics.text_size, lambda keywords: sum(len(k) for k in keywords))
 def extract_keywords(text, num_keywords=10):
-    """Extrae palabras clave del texto."""
-    try:
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=num_keywords)
-        tfidf_matrix = vectorizer.fit_transform([text])
-        return vectorizer.get_feature_names_out()
-    except ValueError:
-        return ["Texto demasiado corto para extraer palabras clave."]
+    """Extrae palabras clave del texto.
+
+    El IDF sale de todas las notas de output/ y del resumen del curso, que se
+    mantienen en un índice persistente; solo se leen las notas nuevas.
+    """
+    global _keyword_index_synced
+    index = yt_keywords.default_index()
+    if not _keyword_index_synced:
+        index.sync(output_folder, [course_summary_file])
+        _keyword_index_synced = True
+    keywords = index.keywords(text, num_keywords)
+    return keywords or ["Texto demasiado corto para extraer palabras clave."]
 
 def create_obsidian_note(title, summary, keywords, original_text, language):
     """Crea una nota en formato Markdown para Obsidian."""
     try:
-        title_cleaned = re.sub(r'[<>:"/\\|?*]', '', title)
-        title_cleaned = title_cleaned[:100]  # Limitar longitud
+        title_cleaned = clean_title(title)
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         note_content = f"""
 # {title_cleaned}
@@ -138,42 +197,197 @@ def create_obsidian_note(title, summary, keywords, original_text, language):
     except Exception as e:
         raise RuntimeError(f"Error al crear la nota: {str(e)}")
 
-# --- Flujo Principal ---
-if __name__ == "__main__":
+def transcribe_video(audio_path, save_mp3=False, title=None, workers=None):
+    """Decodifica y transcribe un audio descargado; recurre a Speech Recognition si Whisper falla."""
+    mp3_path = os.path.join(output_folder, clean_title(title or "audio") + ".mp3") if save_mp3 else None
+    samples = decode_audio(audio_path, mp3_path)
     try:
-        youtube_url = input("Introduce la URL de YouTube: ").strip()
+        if yt_audio.duration(samples) > parallel_threshold_s:
+            original_text = transcribe_long(samples, audio_path, title, workers)
+        else:
+            original_text = transcribe_with_whisper(samples)
+    except Exception as e:
+        print(f"Whisper falló: {str(e)}. Intentando con Google Speech Recognition...")
+        # El respaldo necesita un fichero WAV; solo se escribe en este caso
+        wav_path = yt_audio.write_wav(samples, os.path.join(output_folder, clean_title(title or "audio") + ".wav"))
+        original_text = transcribe_audio(wav_path)
+    if "Error" in original_text:
+        raise ValueError(f"Fallo en la transcripción: {original_text}")
+    return original_text
 
-        print("\nDescargando audio...")
-        audio_path, yt_title = download_audio(youtube_url)
+# --- Modo por lotes ---
+def read_url_list(path):
+    """Lee URLs de un fichero: una o varias por línea, separadas por comas."""
+    with open(path, encoding="utf-8") as f:
+        return [url.strip() for line in f for url in line.split(",") if url.strip().startswith("http")]
 
-        print("\nConvirtiendo el audio a MP3...")
-        mp3_path = convert_to_mp3(audio_path)
+def expand_playlist(url):
+    """Devuelve las URLs de los videos de una lista de reproducción (o la propia URL)."""
+    if "list=" not in url:
+        return [url]
+    try:
+        with yt_dlp.YoutubeDL({'extract_flat': 'in_playlist', 'quiet': True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except Exception as e:
+        raise RuntimeError(f"Error al leer la lista de reproducción: {str(e)}")
+    entries = info.get('entries') or []
+    return [entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}" for entry in entries] or [url]
 
-        print("\nConvirtiendo el audio a WAV...")
-        wav_path = convert_to_wav(mp3_path)
+# Etapas del pipeline: reciben y devuelven un diccionario con el estado del video.
+# Están a nivel de módulo para que la transcripción pueda ir a otro proceso.
+# Cada etapa busca antes su resultado en la caché de artefactos; la clave
+# acumula los parámetros de todas las etapas anteriores. Las mediciones de
+# yt_metrics viajan en video["metrics"] (también desde otros procesos).
+def is_valid(text):
+    return not text.startswith("Error")
 
-        print("\nTranscribiendo audio con Whisper...")
-        try:
-            original_text = transcribe_with_whisper(wav_path)
-        except Exception as e:
-            print(f"Whisper falló: {str(e)}. Intentando con Google Speech Recognition...")
-            original_text = transcribe_audio(wav_path)
+def stage_download(url):
+    with yt_metrics.collect() as records:
+        audio_path, title = download_audio(url)
+    return {"url": url, "audio_path": audio_path, "title": title, "params": {"source": video_key(url)}, "metrics": records}
 
-        if "Error" in original_text:
-            raise ValueError(f"Fallo en la transcripción: {original_text}")
+def stage_transcribe(video, save_mp3=False, workers=None):
+    params = dict(video["params"], whisper=whisper_model)
+    with yt_metrics.collect() as records:
+        text = yt_cache.default_cache().text(
+            "transcripción", params, lambda: transcribe_video(video["audio_path"], save_mp3, video["title"], workers)
+        )
+    return dict(video, original_text=text, params=params, metrics=video["metrics"] + records)
 
-        print("\nTraduciendo texto...")
-        translated_text = translate_text(original_text)
+def stage_translate(video):
+    params = dict(video["params"], language=target_language)
+    with yt_metrics.collect() as records:
+        text = yt_cache.default_cache().text(
+            "traducción", params, lambda: translate_text(video["original_text"], target_language), is_valid
+        )
+    if not is_valid(text):
+        # La transcripción ya está guardada: al repetir se continúa desde aquí
+        raise RuntimeError(text)
+    return dict(video, translated_text=text, params=params, metrics=video["metrics"] + records)
+
+def stage_note(video):
+    cache = yt_cache.default_cache()
+    params = dict(video["params"], summarizer=yt_models.SUMMARY_MODEL)
+    note_key = yt_cache.artifact_key("nota", **params)
+    note_path = cache.get_text(note_key)
+    if note_path and os.path.exists(note_path):
+        print(f"(nota: ya existe {note_path})")
+        return dict(video, note_path=note_path, params=params)
+    with yt_metrics.collect() as records:
+        summary = cache.text("resumen", params, lambda: summarize_text(video["translated_text"]), is_valid)
+        keywords = extract_keywords(video["translated_text"])
+    note_path = create_obsidian_note(video["title"], summary, keywords, video["translated_text"], target_language)
+    yt_keywords.default_index().add_file(note_path)
+    if is_valid(summary):
+        cache.put_text(note_key, note_path, "nota")
+    metrics = video["metrics"] + records
+    # Las mediciones se guardan junto a la nota
+    yt_metrics.write_report(note_path[:-len(".md")] + ".metrics.json", metrics, url=video["url"], title=video["title"])
+    return dict(video, note_path=note_path, params=params, metrics=metrics)
+
+def print_batch_report(items, report):
+    """Muestra el resultado de cada video y el rendimiento del lote."""
+    print("\n--- Resultado del lote ---")
+    for item in items:
+        if item.ok:
+            print(f"[OK]    {item.elapsed:7.1f} s  {item.value['title']} -> {item.value['note_path']}")
+        else:
+            print(f"[FALLO] {item.elapsed:7.1f} s  {item.source} ({item.failed_stage}: {item.error})")
+    print(f"\n{report['ok']}/{report['items']} videos en {report['wall_s']:.1f} s "
+          f"({report['items_per_hour']:.1f} videos/hora)")
+    for name, stage in report["stages"].items():
+        print(f"  {name:<14} {stage['workers']} trabajadores, ocupado {stage['busy_s']:.1f} s "
+              f"({stage['utilization'] * 100:.0f}%)")
+
+def run_batch(urls, save_mp3=False, download_workers=3, transcribe_workers=1, translate_workers=4, queue_size=2, segment_workers=None):
+    """Procesa muchos videos con las etapas en paralelo.
+
+    Descarga y traducción (E/S) van en hilos; la transcripción (CPU) va en
+    procesos. Un video que falla no detiene a los demás.
+    """
+    pipeline = yt_pipeline.Pipeline(
+        [
+            yt_pipeline.Stage("descarga", stage_download, download_workers),
+            yt_pipeline.Stage(
+                "transcripción",
+                functools.partial(stage_transcribe, save_mp3=save_mp3, workers=segment_workers),
+                transcribe_workers,
+                processes=True,
+            ),
+            yt_pipeline.Stage("traducción", stage_translate, translate_workers),
+            yt_pipeline.Stage("nota", stage_note, 1),
+        ],
+        queue_size=queue_size,
+        on_done=lambda item: print(f"Terminado: {item.source} ({'ok' if item.ok else 'fallo'})"),
+    )
+    items = pipeline.run(urls)
+    report = pipeline.report(items)
+    report["stage_metrics"] = yt_metrics.summarize([r for item in items if item.ok for r in item.value["metrics"]])
+    print_batch_report(items, report)
+    print("\n" + yt_metrics.format_summary(report["stage_metrics"]))
+    report_path = os.path.join(output_folder, f"batch_report_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(dict(report, videos=[
+            {"url": item.source, "ok": item.ok, "elapsed_s": round(item.elapsed, 3),
+             "timings_s": {name: round(t, 3) for name, t in item.timings.items()},
+             "error": None if item.ok else f"{item.failed_stage}: {item.error}",
+             "note_path": item.value.get("note_path") if item.ok else None}
+            for item in items
+        ]), f, ensure_ascii=False, indent=2)
+    print(f"Informe guardado en {report_path}")
+    return items
+
+# --- Flujo Principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcribe, traduce y resume videos de YouTube.")
+    parser.add_argument("urls", nargs="*", help="URLs de videos o listas (si no se indica ninguna, se pide por consola)")
+    parser.add_argument("--batch", metavar="FICHERO", action="append", default=[], help="fichero con URLs (estilo isc2.txt); se puede repetir")
+    parser.add_argument("--mp3", action="store_true", help="guardar también una copia MP3 del audio")
+    parser.add_argument("--download-workers", type=int, default=3, help="descargas simultáneas en modo por lotes")
+    parser.add_argument("--transcribe-workers", type=int, default=1, help="procesos de transcripción en modo por lotes")
+    parser.add_argument("--translate-workers", type=int, default=4, help="traducciones simultáneas en modo por lotes")
+    parser.add_argument("--queue-size", type=int, default=2, help="videos en espera entre etapas")
+    parser.add_argument("--segment-workers", type=int, help="procesos que transcriben los tramos de un audio largo")
+    parser.add_argument("--summary-batch", type=int, default=summary_batch_size, help="trozos resumidos en cada pasada del modelo")
+    parser.add_argument("--threads", type=int, help="hilos de CPU para el modelo de resumen")
+    parser.add_argument("--translator", help="motor de traducción: 'google' (por defecto) o 'módulo:clase'")
+    parser.add_argument("--recognizer", help="reconocedor de respaldo: 'google' (por defecto) o 'módulo:clase'")
+    parser.add_argument("--force", action="store_true", help="ignorar los resultados guardados y repetir todas las etapas")
+    args = parser.parse_args()
+    if args.force:
+        # Por entorno, para que también lo vean los procesos de trabajo
+        os.environ["YT_CACHE_FORCE"] = "1"
+    if args.translator:
+        os.environ["YT_TRANSLATE_BACKEND"] = args.translator
+    if args.recognizer:
+        os.environ["YT_SR_BACKEND"] = args.recognizer
+    summary_batch_size, summary_threads = args.summary_batch, args.threads
+
+    urls = list(args.urls)
+    for path in args.batch:
+        urls += read_url_list(path)
 
-        print("\nResumiendo texto...")
-        summary = summarize_text(translated_text)
+    if args.batch or len(urls) > 1 or any("list=" in url for url in urls):
+        urls = [video for url in urls for video in expand_playlist(url)]
+        run_batch(urls, args.mp3, args.download_workers, args.transcribe_workers, args.translate_workers, args.queue_size, args.segment_workers)
+        raise SystemExit(0)
+
+    try:
+        youtube_url = urls[0] if urls else input("Introduce la URL de YouTube: ").strip()
 
-        print("\nExtrayendo palabras clave...")
-        keywords = extract_keywords(translated_text)
+        print("\nDescargando audio...")
+        video = stage_download(youtube_url)
+
+        print("\nDecodificando y transcribiendo audio con Whisper...")
+        video = stage_transcribe(video, args.mp3, args.segment_workers)
+
+        print("\nTraduciendo texto...")
+        video = stage_translate(video)
 
-        print("\nCreando nota para Obsidian...")
-        note_path = create_obsidian_note(yt_title, summary, keywords, translated_text, "es")
-        print(f"Nota creada: {note_path}")
+        print("\nResumiendo texto, extrayendo palabras clave y creando la nota para Obsidian...")
+        video = stage_note(video)
+        print(f"Nota creada: {video['note_path']}")
+        print("\n" + yt_metrics.format_summary(yt_metrics.summarize(video["metrics"])))
 
     except Exception as e:
-        print(f"\nError en el flujo principal: {str(e)}")
\ No newline at end of file
+        print(f"\nError en el flujo principal: {str(e)}")
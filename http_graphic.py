@@ -1,5 +1,16 @@
+import queue
+import sys
+import threading
+import time
 import requests
-from difflib import get_close_matches
+from concurrent.futures import ThreadPoolExecutor
+import pokeapi_compare
+from pokeapi_async import resolve_batch
+from pokeapi_evolution import flatten_chain
+import pokeapi_names
+import pokeapi_mirror
+import pokeapi_suggest
+import pokeapi_trace
 import customtkinter as ctk
 from tkinter import messagebox
 
@@ -7,52 +18,175 @@ from tkinter import messagebox
 ctk.set_appearance_mode("Dark")  # Opciones: "System", "Light", "Dark"
 ctk.set_default_color_theme("blue")  # Opciones: "blue", "green", "dark-blue"
 
-# Función para manejar peticiones HTTP con manejo de errores
-def fetch_data(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None  # Retorna None en caso de error
+# Instante de arranque para medir el tiempo hasta la primera ventana (--timing)
+STARTUP_BEGIN = time.perf_counter()
+
+# Desglose de tiempos por búsqueda en la consola (--profile)
+if "--profile" in sys.argv:
+    pokeapi_trace.enable()
 
 # Función para obtener nombres de Pokémon desde la PokéAPI
 def get_all_pokemon_names():
-    url = "https://pokeapi.co/api/v2/pokemon?limit=10000"
-    data = fetch_data(url)
-    if data:
-        return [pokemon["name"] for pokemon in data["results"]]
-    return []
+    # Se recorre la lista paginada en lugar de pedir limit=10000 de una vez
+    try:
+        return list(pokeapi_names.iter_pokemon_names())
+    except requests.exceptions.RequestException:
+        return []
+
+# Función que actualiza la lista de nombres en segundo plano, página a página
+def refresh_names():
+    # Los índices solo se construyen en este hilo; se empieza por la instantánea
+    snapshot = all_names
+    if snapshot:
+        publish_names(snapshot)
+    names = []
+    try:
+        for page in pokeapi_names.iter_name_pages():
+            names.extend(page)
+            # Sin instantánea, las sugerencias funcionan desde la primera página
+            if len(names) > len(all_names):
+                publish_names(list(names), complete=False)
+    except requests.exceptions.RequestException:
+        return
+    if names:
+        pokeapi_names.save_snapshot(names)
+        publish_names(names)
+
+# Función que completa los índices fuera del hilo de la interfaz y entrega la lista;
+# las búsquedas y el autocompletado usan siempre el último índice publicado
+def publish_names(names, complete=True):
+    pokeapi_suggest.index_for(names, complete)
+    pokeapi_suggest.prefix_index_for(names)
+    names_queue.put(names)
+
+# Estado de las búsquedas en segundo plano: solo se pinta la más reciente
+search_executor = ThreadPoolExecutor(max_workers=2)
+result_queue = queue.Queue()
+names_queue = queue.Queue()
+compare_queue = queue.Queue()
+latest_search_id = 0
+pending_search = None
 
-# Función para buscar información del Pokémon
+# Precarga especulativa del primer candidato del autocompletado
+prefetch_executor = ThreadPoolExecutor(max_workers=1)
+pending_prefetch = None
+last_prefetched = None
+
+# Función para buscar información del Pokémon (no bloquea la ventana)
 def search_pokemon():
+    global latest_search_id, pending_search
     pokemon_name = search_entry.get().strip().lower()
     if not pokemon_name:
         messagebox.showwarning("Entrada vacía", "Por favor, introduce un nombre o número de Pokémon.")
         return
 
-    base_url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_name}/"
-    data = fetch_data(base_url)
+    # Una búsqueda nueva reemplaza a la anterior: si aún no empezó se cancela,
+    # y si ya está en curso su resultado se descartará al llegar
+    latest_search_id += 1
+    if pending_search is not None:
+        pending_search.cancel()
+    set_loading(True)
+    pokeapi_trace.reset()
+    pending_search = search_executor.submit(run_search, latest_search_id, pokemon_name)
+
+# Función que se ejecuta en un hilo de trabajo; nunca toca los widgets
+def run_search(search_id, pokemon_name):
+    try:
+        # Primero la copia local (sin red); si no está, pokémon y especie se piden a la vez
+        result = pokeapi_mirror.lookup(pokemon_name) or resolve_batch([pokemon_name])[0]
+        suggestions = [] if result["pokemon"] else suggest_names(pokemon_name, all_names)
+    except Exception as e:
+        result = {"query": pokemon_name, "pokemon": None, "species": None, "evolution_chain": None, "error": e}
+        suggestions = []
+    result_queue.put((search_id, result, suggestions))
+
+# Función que vacía la cola de resultados desde el hilo de la interfaz
+def poll_results():
+    global all_names
+    try:
+        while True:
+            all_names = names_queue.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        while True:
+            search_id, result, suggestions = result_queue.get_nowait()
+            if search_id == latest_search_id:
+                show_search_result(result, suggestions)
+    except queue.Empty:
+        pass
+    try:
+        while True:
+            show_comparison(*compare_queue.get_nowait())
+    except queue.Empty:
+        pass
+    app.after(50, poll_results)
+
+# Función para mostrar u ocultar el estado de carga
+def set_loading(loading):
+    if loading:
+        search_button.configure(text="Buscando...")
+        info_text.delete("1.0", ctk.END)
+        info_text.insert(ctk.END, "Cargando...")
+        evolution_text.delete("1.0", ctk.END)
+    else:
+        search_button.configure(text="Buscar")
+
+# Función para mostrar el resultado de una búsqueda
+def show_search_result(result, suggestions):
+    set_loading(False)
+    data = result["pokemon"]
 
     if not data:
-        suggestions = suggest_names(pokemon_name, all_names)
+        info_text.delete("1.0", ctk.END)
         if suggestions:
             # Mostrar sugerencias en un menú desplegable
             suggestion_menu.configure(values=suggestions)
             suggestion_menu.set("Selecciona una sugerencia")
             suggestion_menu.grid(row=1, column=0, columnspan=3, pady=10)
+        elif not all_names:
+            messagebox.showinfo("Sin resultados", "No se encontró el Pokémon. La lista de sugerencias aún se está cargando.")
         else:
             messagebox.showinfo("Sin resultados", "No se encontraron coincidencias. Intenta nuevamente.")
         return
 
     display_pokemon_info(data)
-    get_evolution_chain(data["species"]["url"])
+    display_evolution_chain(result["evolution_chain"])
+    if pokeapi_trace.is_enabled():
+        print(pokeapi_trace.format_summary())
+
+# Función para autocompletar mientras se escribe
+def on_search_typed(event):
+    if event.keysym in ("Return", "KP_Enter", "Up", "Down", "Left", "Right", "Escape"):
+        return
+    prefix = search_entry.get().strip().lower()
+    completions = pokeapi_suggest.complete(prefix, all_names, n=5)
+    if not completions:
+        suggestion_menu.grid_remove()
+        return
+    suggestion_menu.configure(values=completions)
+    suggestion_menu.set("Autocompletar...")
+    suggestion_menu.grid(row=1, column=0, columnspan=3, pady=10)
+    prefetch(completions[0])
+
+# Función para descargar en segundo plano el candidato más probable; así, al
+# pulsar Enter, la búsqueda se resuelve desde la memoria en lugar de la red
+def prefetch(pokemon_name):
+    global pending_prefetch, last_prefetched
+    if pokemon_name == last_prefetched or pokeapi_mirror.lookup(pokemon_name):
+        return
+    last_prefetched = pokemon_name
+    if pending_prefetch is not None:
+        pending_prefetch.cancel()  # Solo si aún no había empezado
+    pending_prefetch = prefetch_executor.submit(resolve_batch, [pokemon_name])
 
 # Función para sugerir nombres
+@pokeapi_trace.traced("suggest_names")
 def suggest_names(name, all_names):
-    return get_close_matches(name, all_names, n=5, cutoff=0.6)
+    return pokeapi_suggest.suggest(name, all_names, n=5, cutoff=0.6)
 
 # Función para mostrar información del Pokémon
+@pokeapi_trace.traced("display_pokemon_info")
 def display_pokemon_info(data):
     info_text.delete("1.0", ctk.END)
     info_text.insert(ctk.END, f"Nombre: {data['name'].capitalize()}\n")
@@ -63,30 +197,136 @@ def display_pokemon_info(data):
     info_text.insert(ctk.END, f"Tipo(s): {types}\n")
 
 # Función para mostrar cadena de evolución
-def get_evolution_chain(species_url):
-    species_data = fetch_data(species_url)
-    if not species_data or "evolution_chain" not in species_data:
-        evolution_text.delete("1.0", ctk.END)
+@pokeapi_trace.traced("display_evolution_chain")
+def display_evolution_chain(evolution_data):
+    evolution_text.delete("1.0", ctk.END)
+    if not evolution_data:
         evolution_text.insert(ctk.END, "No se pudo obtener la cadena de evolución.")
         return
 
-    evolution_chain_url = species_data["evolution_chain"]["url"]
-    evolution_data = fetch_data(evolution_chain_url)
+    evolution_text.insert(ctk.END, "Cadena de Evolución:\n")
+    for name, depth in flatten_chain(evolution_data["chain"]):
+        evolution_text.insert(ctk.END, f"- {name.capitalize()}\n")
 
-    if not evolution_data:
-        evolution_text.delete("1.0", ctk.END)
-        evolution_text.insert(ctk.END, "No se pudo obtener la cadena de evolución.")
+# Función para cargar una comparación (type:fire, gen:1 o lista de nombres) sin bloquear
+def compare_pokemon():
+    selection = compare_entry.get().strip()
+    if not selection:
+        messagebox.showwarning("Entrada vacía", "Introduce un tipo (type:fire), una generación (gen:1) o varios nombres.")
         return
+    compare_button.configure(text="Cargando...")
+    search_executor.submit(run_compare, selection)
 
-    evolution_text.delete("1.0", ctk.END)
-    evolution_text.insert(ctk.END, "Cadena de Evolución:\n")
+# Función que se ejecuta en un hilo de trabajo: descarga todas las filas a la vez
+def run_compare(selection):
+    try:
+        rows, missing = pokeapi_compare.load_rows(pokeapi_compare.selection_queries(selection))
+        compare_queue.put((selection, rows, missing, None))
+    except Exception as e:
+        compare_queue.put((selection, [], [], e))
+
+# Función para abrir la ventana de comparación con las filas cargadas
+def show_comparison(selection, rows, missing, error):
+    compare_button.configure(text="Comparar")
+    if error is not None or not rows:
+        messagebox.showinfo("Sin resultados", f"No se pudo cargar '{selection}'.")
+        return
+    ComparisonWindow(app, selection, rows, missing)
+
+# Ventana de comparación virtualizada: solo existen widgets para las filas
+# visibles y al desplazarse se reutilizan cambiando su texto
+class ComparisonWindow(ctk.CTkToplevel):
+    VISIBLE_ROWS = 20
+    COLUMN_WIDTHS = {"id": 60, "name": 170, "types": 170, "weight": 90, "height": 90}
+    NUMERIC = ("id", "weight", "height")
+
+    def __init__(self, master, selection, rows, missing):
+        super().__init__(master)
+        self.title(f"Comparación: {selection}")
+        self.rows = rows
+        self.offset = 0
+        self.sort_key = "id"
+        self.reverse = False
+        self._render_pending = False
 
-    def get_evolves(evolution):
-        evolution_text.insert(ctk.END, f"- {evolution['species']['name'].capitalize()}\n")
-        for evolves_to in evolution.get("evolves_to", []):
-            get_evolves(evolves_to)
+        status = f"{len(rows)} Pokémon"
+        if missing:
+            status += f" · No encontrados: {', '.join(missing[:10])}"
+        ctk.CTkLabel(self, text=status).pack(side="bottom", pady=(0, 10))
 
-    get_evolves(evolution_data["chain"])
+        table = ctk.CTkFrame(self)
+        table.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y", pady=10)
+
+        self.headers = {}
+        for col, (key, title) in enumerate(pokeapi_compare.COLUMNS):
+            button = ctk.CTkButton(
+                table, text=title, width=self.COLUMN_WIDTHS[key], command=lambda k=key: self.sort_by(k)
+            )
+            button.grid(row=0, column=col, padx=2, pady=(0, 5))
+            self.headers[key] = button
+
+        self.cells = []
+        for row in range(self.VISIBLE_ROWS):
+            cells = []
+            for col, (key, _) in enumerate(pokeapi_compare.COLUMNS):
+                cell = ctk.CTkLabel(
+                    table, text="", width=self.COLUMN_WIDTHS[key], anchor="e" if key in self.NUMERIC else "w"
+                )
+                cell.grid(row=row + 1, column=col, padx=2)
+                cells.append(cell)
+            self.cells.append(cells)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind(sequence, self.on_wheel)
+        self.render()
+
+    def sort_by(self, key):
+        self.reverse = not self.reverse if key == self.sort_key else False
+        self.sort_key = key
+        self.rows = pokeapi_compare.sort_rows(self.rows, key, self.reverse)
+        self.scroll_to(0)
+
+    def scroll_to(self, offset):
+        self.offset = min(max(0, offset), max(0, len(self.rows) - self.VISIBLE_ROWS))
+        self.schedule_render()
+
+    def on_scroll(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.rows)))
+        elif action == "scroll":
+            self.scroll_to(self.offset + int(value) * (self.VISIBLE_ROWS if unit == "pages" else 1))
+
+    def on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.offset + (-3 if up else 3))
+
+    def schedule_render(self):
+        # Varios eventos de desplazamiento seguidos producen un único redibujado
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self.render)
+
+    def render(self):
+        self._render_pending = False
+        for i, cells in enumerate(self.cells):
+            index = self.offset + i
+            row = self.rows[index] if index < len(self.rows) else None
+            for (key, _), cell in zip(pokeapi_compare.COLUMNS, cells):
+                text = str(row[key]) if row else ""
+                if cell.cget("text") != text:
+                    cell.configure(text=text)
+        for key, title in pokeapi_compare.COLUMNS:
+            arrow = (" ▼" if self.reverse else " ▲") if key == self.sort_key else ""
+            self.headers[key].configure(text=title + arrow)
+        total = len(self.rows) or 1
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.VISIBLE_ROWS) / total))
+
+# Función para informar del tiempo de arranque
+def report_startup():
+    elapsed = (time.perf_counter() - STARTUP_BEGIN) * 1000
+    print(f"Ventana lista en {elapsed:.1f} ms ({len(all_names)} nombres en la instantánea)")
 
 # Función para manejar selección desde el menú desplegable
 def select_suggestion(selected_name):
@@ -97,10 +337,11 @@ def select_suggestion(selected_name):
 # Crear ventana principal
 app = ctk.CTk()
 app.title("PokéDex")
-app.geometry("700x650")
+app.geometry("700x720")
 
-# Cargar nombres de Pokémon
-all_names = get_all_pokemon_names()
+# Cargar nombres de Pokémon desde la instantánea local; la red se consulta en segundo plano
+all_names = pokeapi_names.load_snapshot()
+threading.Thread(target=refresh_names, daemon=True).start()
 
 # Widgets de la aplicación
 title_label = ctk.CTkLabel(app, text="PokéDex", font=("Arial", 24, "bold"))
@@ -114,6 +355,8 @@ search_label.grid(row=0, column=0, padx=10, pady=10)
 
 search_entry = ctk.CTkEntry(search_frame, width=300, placeholder_text="Ejemplo: pikachu o 25")
 search_entry.grid(row=0, column=1, padx=10, pady=10)
+search_entry.bind("<KeyRelease>", on_search_typed)
+search_entry.bind("<Return>", lambda event: search_pokemon())
 
 search_button = ctk.CTkButton(search_frame, text="Buscar", command=search_pokemon)
 search_button.grid(row=0, column=2, padx=10, pady=10)
@@ -123,6 +366,17 @@ suggestion_menu = ctk.CTkOptionMenu(
     search_frame, values=[], command=select_suggestion, width=300
 )
 
+# Comparación de varios Pokémon
+compare_frame = ctk.CTkFrame(app)
+compare_frame.pack(pady=(0, 10))
+
+compare_entry = ctk.CTkEntry(compare_frame, width=300, placeholder_text="Comparar: type:fire, gen:1 o pikachu,eevee")
+compare_entry.grid(row=0, column=0, padx=10, pady=10)
+compare_entry.bind("<Return>", lambda event: compare_pokemon())
+
+compare_button = ctk.CTkButton(compare_frame, text="Comparar", command=compare_pokemon)
+compare_button.grid(row=0, column=1, padx=10, pady=10)
+
 info_label = ctk.CTkLabel(app, text="Información del Pokémon", font=("Arial", 18, "bold"))
 info_label.pack(pady=10)
 
@@ -136,4 +390,7 @@ evolution_text = ctk.CTkTextbox(app, width=300, height=150)
 evolution_text.pack(pady=10)
 
 # Ejecutar aplicación
+app.after(50, poll_results)
+if "--timing" in sys.argv:
+    app.after_idle(report_startup)
 app.mainloop()
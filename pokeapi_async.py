@@ -0,0 +1,186 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pokeapi_evolution
+import pokeapi_memo
+from pokeapi_client import API_URL
+
+
+class BatchResolver:
+    """Resuelve pokémon, especie y cadena de evolución de forma concurrente.
+
+    Las peticiones se ejecutan en hilos (``fetch`` es síncrona) bajo un
+    semáforo que limita la concurrencia, y cada cadena de evolución se
+    descarga una sola vez aunque la compartan varias especies. Las cadenas
+    ya presentes en el índice de evolución no se descargan, salvo con
+    ``refresh_chains``, que las vuelve a pedir y actualiza el índice.
+    """
+
+    def __init__(self, concurrency=10, fetch=None, evolution_index=None, refresh_chains=False):
+        self.concurrency = concurrency
+        self.refresh_chains = refresh_chains
+        self.fetch = fetch or pokeapi_memo.fetch_json
+        if evolution_index is None:
+            evolution_index = pokeapi_evolution.default_index()
+        self.evolution_index = evolution_index
+        self._learned = False
+        self._semaphore = None
+        self._executor = None
+        self._chains = {}
+
+    async def _get(self, url):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.fetch, url)
+
+    def _get_chain(self, url):
+        # Todas las especies de una misma familia esperan la misma tarea
+        task = self._chains.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._get(url))
+            self._chains[url] = task
+        return task
+
+    async def resolve(self, query):
+        """Devuelve un diccionario con los documentos de un pokémon."""
+        query = str(query).strip().lower()
+        result = {"query": query, "pokemon": None, "species": None, "evolution_chain": None, "error": None}
+        pokemon, species = await asyncio.gather(
+            self._get(f"{API_URL}/pokemon/{query}/"),
+            self._get(f"{API_URL}/pokemon-species/{query}/"),
+            return_exceptions=True,
+        )
+        if isinstance(pokemon, BaseException):
+            result["error"] = pokemon
+            return result
+        result["pokemon"] = pokemon
+
+        # Las formas alternativas (p. ej. "charizard-mega") no comparten nombre con su especie
+        if isinstance(species, BaseException):
+            try:
+                species = await self._get(pokemon["species"]["url"])
+            except Exception as e:
+                result["error"] = e
+                return result
+        result["species"] = species
+
+        evolution_chain = None if self.refresh_chains else self.evolution_index.chain_document(species["name"])
+        chain_url = (species.get("evolution_chain") or {}).get("url")
+        if evolution_chain is None and chain_url:
+            try:
+                evolution_chain = await self._get_chain(chain_url)
+            except Exception as e:
+                result["error"] = e
+            else:
+                self.evolution_index.add_chain(evolution_chain)
+                self._learned = True
+        result["evolution_chain"] = evolution_chain
+        return result
+
+    async def resolve_many(self, queries):
+        """Resuelve todas las consultas y devuelve los resultados en orden."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._chains = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            results = await asyncio.gather(*(self.resolve(q) for q in queries))
+        if self._learned:
+            self.evolution_index.save()
+            self._learned = False
+        return results
+
+    async def resolve_stream(self, queries, max_pending=None):
+        """Itera los resultados a medida que terminan, en orden de llegada.
+
+        ``queries`` puede ser cualquier iterable, incluso uno que bloquea
+        (p. ej. stdin): se consume en un hilo aparte, así que cada resultado
+        sale en cuanto termina aunque la siguiente línea tarde en llegar.
+        Nunca hay más de ``max_pending`` consultas en curso, así que la
+        memoria no crece con el tamaño de la entrada.
+        """
+        max_pending = max_pending or self.concurrency * 2
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._chains = {}
+        loop = asyncio.get_running_loop()
+        inbox = asyncio.Queue()
+        slots = threading.Semaphore(max_pending)
+        stop = threading.Event()
+
+        def read_queries():
+            try:
+                for query in queries:
+                    # Espera a que haya hueco antes de leer la siguiente consulta
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(inbox.put_nowait, (_QUERY, query))
+            except BaseException as e:
+                loop.call_soon_threadsafe(inbox.put_nowait, (_FAILED, e))
+            else:
+                loop.call_soon_threadsafe(inbox.put_nowait, (_END, None))
+
+        reader = threading.Thread(target=read_queries, name="pokeapi-batch-reader", daemon=True)
+        pending = set()
+        getter = None
+        exhausted = False
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            reader.start()
+            try:
+                while pending or not exhausted:
+                    if not exhausted and getter is None:
+                        getter = asyncio.ensure_future(inbox.get())
+                    waiting = pending | {getter} if getter else pending
+                    done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    if getter in done:
+                        kind, value = getter.result()
+                        getter = None
+                        if kind is _QUERY:
+                            pending.add(asyncio.ensure_future(self.resolve(value)))
+                        elif kind is _FAILED:
+                            raise value
+                        else:
+                            exhausted = True
+                    for task in done & pending:
+                        pending.discard(task)
+                        slots.release()
+                        yield task.result()
+            finally:
+                stop.set()
+                if getter is not None:
+                    getter.cancel()
+                for task in pending:
+                    task.cancel()
+        if self._learned:
+            self.evolution_index.save()
+            self._learned = False
+
+
+_QUERY, _FAILED, _END = object(), object(), object()
+
+
+async def resolve_many(queries, concurrency=10, fetch=None):
+    """Atajo asíncrono para resolver una lista de nombres o IDs."""
+    return await BatchResolver(concurrency, fetch).resolve_many(queries)
+
+
+def resolve_batch(queries, concurrency=10, fetch=None):
+    """Versión síncrona de ``resolve_many`` para código sin bucle de eventos."""
+    return asyncio.run(resolve_many(queries, concurrency, fetch))
+
+
+async def fetch_many(urls, concurrency=10, fetch=None):
+    """Descarga varias URLs a la vez; devuelve documentos o excepciones, en orden."""
+    fetch = fetch or pokeapi_memo.fetch_json
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, fetch, url) for url in urls), return_exceptions=True
+        )
+
+
+def fetch_batch(urls, concurrency=10, fetch=None):
+    """Versión síncrona de ``fetch_many``."""
+    return asyncio.run(fetch_many(urls, concurrency, fetch))
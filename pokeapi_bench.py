@@ -0,0 +1,192 @@
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from rich.console import Console
+from rich.table import Table
+
+from pokeapi_fixture_server import FixtureServer
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_history.jsonl")
+TYPOS = ["pikachuu", "bulbasor", "charmandr", "eve", "squirtl", "raichuu", "zzzz"]
+
+console = Console()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def latency_metrics(prefix, samples, metrics):
+    """Añade p50/p99 en milisegundos de una lista de duraciones en segundos."""
+    metrics[f"{prefix}_p50_ms"] = percentile(samples, 0.50) * 1000
+    metrics[f"{prefix}_p99_ms"] = percentile(samples, 0.99) * 1000
+
+
+def measure_startup(env, runs=3):
+    """Tiempo de importar la consola y cargar la lista de nombres en un proceso nuevo."""
+    code = "import HTTP_peticiones as h; assert h.get_all_pokemon_names()"
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=here, env=env, check=True)
+        samples.append(time.perf_counter() - started)
+    return samples[0], percentile(samples[1:], 0.5)
+
+
+def run(latency=0.02, rounds=5, batch_repeat=12):
+    metrics = {}
+    with tempfile.TemporaryDirectory() as cache_dir, FixtureServer(latency=latency, seed=1) as server:
+        # La configuración se lee al importar, así que los módulos se importan después
+        env = dict(os.environ, POKEAPI_URL=server.url, POKEDEX_CACHE_DIR=cache_dir)
+        os.environ.update(POKEAPI_URL=server.url, POKEDEX_CACHE_DIR=cache_dir)
+        metrics["startup_cold_ms"], metrics["startup_warm_ms"] = (t * 1000 for t in measure_startup(env))
+
+        import HTTP_peticiones
+        import pokeapi_cache
+        import pokeapi_evolution
+        import pokeapi_memo
+        import pokeapi_mirror
+        from difflib import get_close_matches
+        from pokeapi_async import resolve_batch
+
+        HTTP_peticiones.console = Console(file=io.StringIO())  # Sin salida durante la medición
+        cache = pokeapi_cache.default_cache()
+        memo = pokeapi_memo.default_memo()
+        names = HTTP_peticiones.get_all_pokemon_names()
+        urls = [f"{server.url}/pokemon/{name}/" for name in names]
+
+        def reset(disk=True):
+            memo.clear()
+            if disk:
+                cache.invalidate()
+                # Las mediciones en frío tampoco pueden usar el índice de evolución ni la copia local
+                pokeapi_evolution._index = pokeapi_evolution.EvolutionIndex()
+                pokeapi_mirror._mirror = None
+
+        # fetch_json: red (frío), caché en disco y memoria
+        reset()
+        latency_metrics("fetch_cold", [timed(pokeapi_memo.fetch_json, url) for url in urls], metrics)
+        reset(disk=False)
+        latency_metrics("fetch_disk", [timed(pokeapi_memo.fetch_json, url) for url in urls], metrics)
+        latency_metrics(
+            "fetch_memo", [timed(pokeapi_memo.fetch_json, url) for _ in range(rounds) for url in urls], metrics
+        )
+
+        # get_pokemon_info completo (pokémon + especie + cadena + renderizado)
+        reset()
+        latency_metrics("info_cold", [timed(HTTP_peticiones.get_pokemon_info, n, names) for n in names], metrics)
+        latency_metrics(
+            "info_warm",
+            [timed(HTTP_peticiones.get_pokemon_info, n, names) for _ in range(rounds) for n in names],
+            metrics,
+        )
+
+        # Peticiones por segundo en lotes concurrentes
+        batch = names * batch_repeat
+        reset()
+        metrics["batch_cold_rps"] = len(batch) / timed(resolve_batch, batch)
+        metrics["batch_warm_rps"] = len(batch) / timed(resolve_batch, batch)
+
+        # Sugerencias: índice frente a difflib
+        typos = TYPOS * rounds
+        latency_metrics("suggest", [timed(HTTP_peticiones.suggest_names, t, names) for t in typos], metrics)
+        latency_metrics(
+            "suggest_difflib", [timed(get_close_matches, t, names, 5, 0.6) for t in typos], metrics
+        )
+
+        metrics["disk_cache_hit_ratio"] = cache.stats()["hit_ratio"]
+        memo_stats = memo.stats()
+        lookups = memo_stats["hits"] + memo_stats["misses"] + memo_stats["coalesced"]
+        metrics["memo_hit_ratio"] = (memo_stats["hits"] + memo_stats["coalesced"]) / lookups if lookups else 0.0
+        metrics["server_requests"] = server.counters["requests"]
+    return metrics
+
+
+def higher_is_better(metric):
+    return metric.endswith("_rps") or metric.endswith("_ratio")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path, params):
+    """Última ejecución del historial con los mismos parámetros, o None."""
+    previous = None
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry.get("params") == params:
+                    previous = entry
+    except OSError:
+        pass
+    return previous
+
+
+def report(metrics, previous, threshold):
+    """Imprime la tabla de resultados y devuelve las métricas que empeoraron."""
+    table = Table(title="[bold cyan]Benchmark PokéDex[/bold cyan]")
+    table.add_column("Métrica", style="bold magenta")
+    table.add_column("Valor", justify="right", style="bold yellow")
+    table.add_column("Anterior", justify="right")
+    table.add_column("Cambio", justify="right")
+    regressions = []
+    for metric, value in metrics.items():
+        old = (previous or {}).get("metrics", {}).get(metric)
+        change = ""
+        if old:
+            delta = (value - old) / old
+            worse = -delta if higher_is_better(metric) else delta
+            change = f"{delta:+.1%}"
+            if worse > threshold and metric != "server_requests":
+                regressions.append(metric)
+                change = f"[red]{change} REGRESIÓN[/red]"
+        table.add_row(metric, f"{value:.3f}", f"{old:.3f}" if old is not None else "-", change)
+    console.print(table)
+    return regressions
+
+
+# Comando: python pokeapi_bench.py [--latency S] [--rounds N] [--history FICHERO]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sin conexión de los clientes de la PokéDex.")
+    parser.add_argument("--latency", type=float, default=0.02, help="latencia simulada por petición (s)")
+    parser.add_argument("--rounds", type=int, default=5, help="repeticiones de las mediciones en caliente")
+    parser.add_argument("--batch-repeat", type=int, default=12, help="veces que se repite la lista en el lote")
+    parser.add_argument("--history", default=HISTORY_PATH, help="fichero JSONL con el historial de ejecuciones")
+    parser.add_argument("--threshold", type=float, default=0.2, help="empeoramiento relativo que cuenta como regresión")
+    args = parser.parse_args()
+
+    params = {"latency": args.latency, "rounds": args.rounds, "batch_repeat": args.batch_repeat}
+    metrics = run(**params)
+    previous = load_previous(args.history, params)
+    regressions = report(metrics, previous, args.threshold)
+
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "params": params,
+            "metrics": metrics,
+        }) + "\n")
+    sys.exit(1 if regressions else 0)
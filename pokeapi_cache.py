@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+import pokeapi_trace
+from pokeapi_client import default_client
+
+# Directorio local compartido por las dos versiones de la PokéDex
+CACHE_DIR = os.environ.get(
+    "POKEDEX_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "pokedex")
+)
+
+DAY = 24 * 60 * 60
+
+# Tiempo de vida (segundos) según el recurso de la PokéAPI
+ENDPOINT_TTLS = {
+    "pokemon": 7 * DAY,
+    "pokemon-species": 30 * DAY,
+    "evolution-chain": 30 * DAY,
+}
+LIST_TTL = DAY  # Listados paginados como /pokemon?limit=10000
+DEFAULT_TTL = DAY
+
+
+def endpoint_ttl(url):
+    """Devuelve el TTL que corresponde al recurso de la URL."""
+    parsed = urlparse(url)
+    parts = [p for p in parsed.path.split("/") if p]
+    if "v2" in parts:
+        parts = parts[parts.index("v2") + 1:]
+    if not parts:
+        return DEFAULT_TTL
+    if len(parts) == 1:
+        return LIST_TTL
+    return ENDPOINT_TTLS.get(parts[0], DEFAULT_TTL)
+
+
+class ResponseCache:
+    """Caché persistente en SQLite de respuestas JSON de la PokéAPI."""
+
+    def __init__(self, path=None, max_bytes=64 * 1024 * 1024, http_get=None, ttl_for=endpoint_ttl):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "responses.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_for = ttl_for
+        self._http_get = http_get or default_client().get
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+        self._conn.commit()
+        self._counters = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evictions": 0}
+
+    def _count(self, key):
+        # fetch_json se llama desde varios hilos a la vez (BatchResolver)
+        with self._lock:
+            self._counters[key] += 1
+
+    def _lookup(self, url):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+    def _touch(self, url, now, refreshed=False):
+        with self._lock:
+            if refreshed:
+                self._conn.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+                )
+            else:
+                self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+
+    def _store(self, url, content, etag, last_modified, now):
+        body = zlib.compress(content)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self._counters["stored"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Elimina las entradas usadas hace más tiempo hasta respetar max_bytes
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            self._counters["evictions"] += 1
+
+    def fetch_json(self, url, max_age=None):
+        """Devuelve el JSON de la URL, usando la caché y revalidando si caducó.
+
+        ``max_age`` sustituye al TTL del recurso (``0`` fuerza una petición
+        condicional aunque la entrada no haya caducado). Lanza las
+        excepciones de ``requests`` si la petición falla.
+        """
+        now = time.time()
+        with pokeapi_trace.span("cache.lookup"):
+            row = self._lookup(url)
+        if row is not None:
+            body, etag, last_modified, stored_at = row
+            if now - stored_at < (self.ttl_for(url) if max_age is None else max_age):
+                self._count("hits")
+                self._touch(url, now)
+                with pokeapi_trace.span("json"):
+                    return json.loads(zlib.decompress(body))
+
+        headers = {}
+        if row is not None:
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = self._http_get(url, headers=headers)
+        if response.status_code == 304 and row is not None:
+            self._count("revalidated")
+            self._touch(url, now, refreshed=True)
+            with pokeapi_trace.span("json"):
+                return json.loads(zlib.decompress(row[0]))
+
+        response.raise_for_status()
+        self._count("misses")
+        with pokeapi_trace.span("json"):
+            data = response.json()
+        with pokeapi_trace.span("cache.store"):
+            self._store(
+                url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                now,
+            )
+        return data
+
+    def invalidate(self, url=None):
+        """Elimina una URL de la caché, o toda la caché si no se indica."""
+        with self._lock:
+            if url is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def stats(self):
+        """Devuelve contadores de uso y el tamaño actual de la caché."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"] + stats["revalidated"]
+        stats.update(
+            entries=entries,
+            bytes=size,
+            max_bytes=self.max_bytes,
+            hit_ratio=(stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0,
+        )
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Devuelve la caché compartida del proceso, creándola la primera vez."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def fetch_json(url, max_age=None):
+    """Atajo para obtener una URL a través de la caché compartida."""
+    return default_cache().fetch_json(url, max_age)
@@ -0,0 +1,98 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import pokeapi_trace
+
+# URL base de la PokéAPI (se puede apuntar a un servidor local)
+API_URL = os.environ.get("POKEAPI_URL", "https://pokeapi.co/api/v2").rstrip("/")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value):
+    """Convierte la cabecera Retry-After (segundos o fecha HTTP) a segundos."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class PokeAPIClient:
+    """Cliente HTTP con conexiones persistentes, timeouts y reintentos."""
+
+    def __init__(
+        self,
+        pool_size=10,
+        connect_timeout=3.05,
+        read_timeout=10,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+
+    def _backoff(self, attempt, response=None):
+        # Backoff exponencial con jitter completo; Retry-After tiene prioridad
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    def get(self, url, headers=None, **kwargs):
+        """GET con reintentos ante errores de conexión, 5xx y 429."""
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            try:
+                with pokeapi_trace.span("http") as span:
+                    response = self.session.get(url, headers=headers, **kwargs)
+                    if pokeapi_trace.is_enabled():
+                        span.bytes = int(response.headers.get("Content-Length") or len(response.content))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = self._backoff(attempt, response)
+                response.close()
+                time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """Devuelve el cliente compartido del proceso, creándolo la primera vez."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = PokeAPIClient()
+        return _default_client
@@ -0,0 +1,75 @@
+import re
+
+import pokeapi_memo
+import pokeapi_mirror
+from pokeapi_async import fetch_batch
+from pokeapi_client import API_URL
+
+# Columnas de la vista comparativa: (clave, título)
+COLUMNS = (
+    ("id", "ID"),
+    ("name", "Nombre"),
+    ("types", "Tipo(s)"),
+    ("weight", "Peso (hg)"),
+    ("height", "Altura (dm)"),
+)
+
+
+def _id_from_url(url):
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+
+def selection_queries(text):
+    """Convierte una selección en la lista de pokémon a comparar.
+
+    Admite ``type:fire``, ``gen:1`` (o ``generation:1``) y listas de nombres
+    o IDs separados por comas o espacios.
+    """
+    text = text.strip().lower()
+    kind, _, value = text.partition(":")
+    if value and kind == "type":
+        data = pokeapi_memo.fetch_json(f"{API_URL}/type/{value}/")
+        return [entry["pokemon"]["name"] for entry in data["pokemon"]]
+    if value and kind in ("gen", "generation"):
+        data = pokeapi_memo.fetch_json(f"{API_URL}/generation/{value}/")
+        # El pokémon por defecto comparte ID con su especie, no siempre el nombre
+        # (deoxys -> deoxys-normal, giratina -> giratina-altered...)
+        return [str(species_id) for species_id in sorted(_id_from_url(s["url"]) for s in data["pokemon_species"])]
+    return [q for q in re.split(r"[\s,]+", text) if q]
+
+
+def make_row(data):
+    """Fila de la comparación a partir de un documento /pokemon/{id}."""
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "types": ", ".join(t["type"]["name"] for t in data["types"]),
+        "weight": data["weight"],
+        "height": data["height"],
+    }
+
+
+def load_rows(queries, concurrency=20):
+    """Carga las filas de todos los pokémon a la vez; devuelve (filas, no_encontrados)."""
+    rows = []
+    remote = []
+    for query in queries:
+        local = pokeapi_mirror.lookup(query)
+        if local:
+            rows.append(make_row(local["pokemon"]))
+        else:
+            remote.append(query)
+
+    urls = [f"{API_URL}/pokemon/{query}/" for query in remote]
+    missing = []
+    for query, data in zip(remote, fetch_batch(urls, concurrency)):
+        if isinstance(data, BaseException):
+            missing.append(query)
+        else:
+            rows.append(make_row(data))
+    return sort_rows(rows, "id"), missing
+
+
+def sort_rows(rows, key, reverse=False):
+    """Devuelve las filas ordenadas por una columna."""
+    return sorted(rows, key=lambda row: row[key], reverse=reverse)
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pokeapi_cache
+from pokeapi_client import API_URL
+
+INDEX_PATH = os.path.join(pokeapi_cache.CACHE_DIR, "evolution_index.json")
+INDEX_VERSION = 1
+
+
+def flatten_chain(chain):
+    """Convierte la cadena anidada de la PokéAPI en una lista [nombre, profundidad] en preorden.
+
+    Se recorre con una pila explícita, así que la profundidad no está limitada
+    por la recursión de Python.
+    """
+    stages = []
+    stack = [(chain, 0)]
+    while stack:
+        node, depth = stack.pop()
+        stages.append([node["species"]["name"], depth])
+        for child in reversed(node.get("evolves_to", [])):
+            stack.append((child, depth + 1))
+    return stages
+
+
+def nest_chain(stages):
+    """Reconstruye la forma anidada {"species", "evolves_to"} a partir de la lista plana."""
+    root = None
+    parents = []
+    for stage in stages:
+        name, depth = stage[0], stage[1]
+        node = {"species": {"name": name}, "evolves_to": []}
+        del parents[depth:]
+        if parents:
+            parents[-1]["evolves_to"].append(node)
+        else:
+            root = node
+        parents.append(node)
+    return root
+
+
+class EvolutionIndex:
+    """Índice especie → cadena → etapas ordenadas, con la estructura de ramas.
+
+    Cada cadena se guarda como una lista en preorden de ``[nombre, profundidad,
+    padre]``, de modo que mostrarla o consultar la familia de una especie es
+    una búsqueda en diccionario sin volver a descargar ni recorrer el JSON.
+    """
+
+    def __init__(self, chains=None):
+        self.chains = chains or {}
+        self.species = {
+            name: chain_id for chain_id, stages in self.chains.items() for name, _, _ in stages
+        }
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.chains)
+
+    def __contains__(self, species):
+        return species in self.species
+
+    def add_chain(self, evolution_data):
+        """Añade un documento /evolution-chain/{id} al índice y devuelve su ID."""
+        chain_id = str(evolution_data["id"])
+        parents = []
+        stages = []
+        for name, depth in flatten_chain(evolution_data["chain"]):
+            del parents[depth:]
+            stages.append([name, depth, parents[-1] if parents else None])
+            parents.append(name)
+        with self._lock:
+            self.chains[chain_id] = stages
+            for name, _, _ in stages:
+                self.species[name] = chain_id
+        return chain_id
+
+    def stages(self, species):
+        """Etapas ``[nombre, profundidad, padre]`` de la familia de la especie, o []."""
+        chain_id = self.species.get(species)
+        return self.chains[chain_id] if chain_id is not None else []
+
+    def family(self, species):
+        """Todos los miembros de la familia evolutiva, en orden."""
+        return [name for name, _, _ in self.stages(species)]
+
+    def evolves_from(self, species):
+        """Especie de la que evoluciona, o None si es la etapa base."""
+        for name, _, parent in self.stages(species):
+            if name == species:
+                return parent
+        return None
+
+    def evolves_to(self, species):
+        """Especies a las que evoluciona directamente."""
+        return [name for name, _, parent in self.stages(species) if parent == species]
+
+    def final_stages(self, species):
+        """Etapas finales de la familia (las que no evolucionan más)."""
+        stages = self.stages(species)
+        parents = {parent for _, _, parent in stages}
+        return [name for name, _, _ in stages if name not in parents]
+
+    def chain_document(self, species):
+        """Documento con la forma de /evolution-chain/{id}, o None si no está indexada."""
+        chain_id = self.species.get(species)
+        if chain_id is None:
+            return None
+        return {"id": int(chain_id), "chain": nest_chain(self.chains[chain_id])}
+
+    def save(self, path=INDEX_PATH):
+        """Guarda el índice en disco de forma atómica."""
+        with self._lock:
+            data = json.dumps({"version": INDEX_VERSION, "chains": self.chains})
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Carga el índice del disco; devuelve uno vacío si no existe o no es válido."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data["chains"])
+
+
+def build(index=None, concurrency=20, path=INDEX_PATH):
+    """Descarga todas las cadenas de evolución y las añade al índice."""
+    if index is None:
+        index = EvolutionIndex.load(path)
+    listing = pokeapi_cache.fetch_json(f"{API_URL}/evolution-chain?limit=10000")
+    urls = [chain["url"] for chain in listing["results"]]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for evolution_data in executor.map(pokeapi_cache.fetch_json, urls):
+            index.add_chain(evolution_data)
+    index.save(path)
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def default_index():
+    """Devuelve el índice compartido del proceso, cargándolo del disco la primera vez."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = EvolutionIndex.load()
+        return _index
+
+
+# Comando: python pokeapi_evolution.py (construye el índice completo)
+if __name__ == "__main__":
+    index = build()
+    print(f"Índice de evolución: {len(index)} cadenas, {len(index.species)} especies en {INDEX_PATH}")
@@ -0,0 +1,229 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Respuestas grabadas: {"pokemon/25": {...}, "pokemon-species/25": {...}, ...}
+# Las URLs internas usan "{base}" en lugar de la dirección de la API.
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pokeapi.json")
+PLACEHOLDER = "{base}"
+RESOURCES = ("pokemon", "pokemon-species", "evolution-chain")
+
+
+class FixtureStore:
+    """Documentos grabados de la PokéAPI, accesibles por nombre o ID."""
+
+    def __init__(self, path=FIXTURES_PATH):
+        with open(path, encoding="utf-8") as f:
+            self.documents = json.load(f)
+        self.aliases = {}
+        for key, doc in self.documents.items():
+            resource, _ = key.split("/", 1)
+            if "name" in doc:
+                self.aliases[f"{resource}/{doc['name']}"] = key
+
+    def get(self, resource, ident):
+        key = f"{resource}/{ident}"
+        return self.documents.get(self.aliases.get(key, key))
+
+    def listing(self, resource):
+        """Entradas del recurso ordenadas por ID, como en /pokemon?limit=..."""
+        entries = []
+        for key, doc in self.documents.items():
+            kind, ident = key.split("/", 1)
+            if kind == resource:
+                entries.append((int(ident), doc.get("name")))
+        entries.sort()
+        return [
+            {"name": name, "url": f"{PLACEHOLDER}/{resource}/{ident}/"} if name
+            else {"url": f"{PLACEHOLDER}/{resource}/{ident}/"}
+            for ident, name in entries
+        ]
+
+
+class FixtureServer:
+    """Servidor HTTP local que imita la PokéAPI con latencia y fallos configurables.
+
+    ``error_rate`` y ``rate_limit_rate`` son probabilidades (0-1) de responder
+    500 o 429 (con Retry-After) en lugar del documento.
+    """
+
+    def __init__(self, store=None, port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, retry_after=1, seed=None):
+        self.store = store or FixtureStore()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.counters = {"requests": 0, "ok": 0, "not_modified": 0, "not_found": 0, "errors": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL base de la API local (equivalente a https://pokeapi.co/api/v2)."""
+        return f"http://127.0.0.1:{self._httpd.server_port}/api/v2"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def resolve(self, path, query):
+        """Devuelve el documento para la ruta pedida, o None si no existe."""
+        match = re.fullmatch(r"/api/v2/([\w-]+)/?([\w-]*)/?", path)
+        if not match or match.group(1) not in RESOURCES:
+            return None
+        resource, ident = match.groups()
+        if ident:
+            return self.store.get(resource, ident.lower())
+
+        # Listado paginado con limit/offset y enlaces next/previous
+        params = parse_qs(query)
+        limit = int(params.get("limit", ["20"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        results = self.store.listing(resource)
+        def page_url(page_offset):
+            return f"{PLACEHOLDER}/{resource}?offset={page_offset}&limit={limit}"
+
+        return {
+            "count": len(results),
+            "next": page_url(offset + limit) if offset + limit < len(results) else None,
+            "previous": page_url(max(0, offset - limit)) if offset > 0 else None,
+            "results": results[offset:offset + limit],
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Cabeceras y cuerpo van en escrituras separadas
+
+            def do_GET(self):
+                server._count("requests")
+                delay = server.latency + server.random.uniform(0, server.jitter)
+                if delay:
+                    time.sleep(delay)
+
+                roll = server.random.random()
+                if roll < server.rate_limit_rate:
+                    server._count("rate_limited")
+                    return self._send(429, b"", {"Retry-After": str(server.retry_after)})
+                if roll < server.rate_limit_rate + server.error_rate:
+                    server._count("errors")
+                    return self._send(500, b"")
+
+                parsed = urlparse(self.path)
+                doc = server.resolve(parsed.path, parsed.query)
+                if doc is None:
+                    server._count("not_found")
+                    return self._send(404, b"Not Found")
+
+                body = json.dumps(doc).replace(PLACEHOLDER, server.url).encode()
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    server._count("not_modified")
+                    return self._send(304, b"", {"ETag": etag})
+                server._count("ok")
+                self._send(200, body, {"Content-Type": "application/json", "ETag": etag})
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def record(names, path=FIXTURES_PATH, api_url="https://pokeapi.co/api/v2"):
+    """Graba desde la API real el pokémon, la especie y la cadena de cada nombre."""
+    from pokeapi_client import default_client
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            documents = json.load(f)
+    except OSError:
+        documents = {}
+
+    def get(url):
+        response = default_client().get(url)
+        response.raise_for_status()
+        return json.loads(response.text.replace(api_url, PLACEHOLDER))
+
+    for name in names:
+        pokemon = get(f"{api_url}/pokemon/{name}/")
+        species = get(pokemon["species"]["url"].replace(PLACEHOLDER, api_url))
+        chain = get(species["evolution_chain"]["url"].replace(PLACEHOLDER, api_url))
+        documents[f"pokemon/{pokemon['id']}"] = pokemon
+        documents[f"pokemon-species/{species['id']}"] = species
+        documents[f"evolution-chain/{chain['id']}"] = chain
+        print(f"Grabado: {name}")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(documents, f, indent=1, sort_keys=True)
+
+
+# Comando: python pokeapi_fixture_server.py [serve|record] ...
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sustituto local de la PokéAPI para pruebas y benchmarks.")
+    sub = parser.add_subparsers(dest="command")
+    serve = sub.add_parser("serve", help="servir las respuestas grabadas")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.0, help="latencia fija por petición (s)")
+    serve.add_argument("--jitter", type=float, default=0.0, help="latencia aleatoria adicional (s)")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="probabilidad de responder 500")
+    serve.add_argument("--rate-limit-rate", type=float, default=0.0, help="probabilidad de responder 429")
+    rec = sub.add_parser("record", help="grabar respuestas de la API real")
+    rec.add_argument("names", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.names)
+    else:
+        server = FixtureServer(
+            port=getattr(args, "port", 8765),
+            latency=getattr(args, "latency", 0.0),
+            jitter=getattr(args, "jitter", 0.0),
+            error_rate=getattr(args, "error_rate", 0.0),
+            rate_limit_rate=getattr(args, "rate_limit_rate", 0.0),
+        )
+        print(f"PokéAPI local en {server.url} (POKEAPI_URL={server.url})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pokeapi_cache
+import pokeapi_trace
+
+
+class MemoFetcher:
+    """LRU en memoria delante de ``fetch`` con coalescencia de peticiones.
+
+    Si varias llamadas (desde hilos o corrutinas) piden la misma URL mientras
+    ya hay una descarga en curso, todas esperan esa única descarga y reciben
+    el mismo resultado. Los errores no se guardan en la memoria.
+    """
+
+    def __init__(self, fetch=None, max_entries=256, max_age=300):
+        self.fetch = fetch or pokeapi_cache.fetch_json
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()  # url -> (guardado_en, datos)
+        self._in_flight = {}  # url -> Future
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def _lookup(self, url):
+        # Devuelve (encontrado, datos, future, es_líder) bajo el cerrojo
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                if time.monotonic() - entry[0] < self.max_age:
+                    self._entries.move_to_end(url)
+                    self._counters["hits"] += 1
+                    return True, entry[1], None, False
+                del self._entries[url]
+                self._counters["evictions"] += 1
+            future = self._in_flight.get(url)
+            if future is not None:
+                self._counters["coalesced"] += 1
+                return False, None, future, False
+            future = Future()
+            self._in_flight[url] = future
+            self._counters["misses"] += 1
+            return False, None, future, True
+
+    def _run(self, url, future):
+        try:
+            data = self.fetch(url)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[url]
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[url] = (time.monotonic(), data)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+            del self._in_flight[url]
+        future.set_result(data)
+
+    @pokeapi_trace.traced("fetch")
+    def fetch_json(self, url):
+        """Versión síncrona: segura para llamar desde varios hilos."""
+        found, data, future, leader = self._lookup(url)
+        if found:
+            return data
+        if leader:
+            self._run(url, future)
+        return future.result()
+
+    async def fetch_json_async(self, url):
+        """Versión para asyncio: la descarga se hace en un hilo del bucle."""
+        found, data, future, leader = self._lookup(url)
+        if found:
+            return data
+        if leader:
+            asyncio.get_running_loop().run_in_executor(None, self._run, url, future)
+        return await asyncio.wrap_future(future)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Devuelve los contadores de aciertos, fallos, coalescencias y expulsiones."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update(entries=len(self._entries), in_flight=len(self._in_flight))
+        return stats
+
+
+_default_memo = None
+_default_lock = threading.Lock()
+
+
+def default_memo():
+    """Devuelve la memoria compartida del proceso, creándola la primera vez."""
+    global _default_memo
+    with _default_lock:
+        if _default_memo is None:
+            _default_memo = MemoFetcher()
+        return _default_memo
+
+
+def fetch_json(url):
+    """Atajo para obtener una URL a través de la memoria compartida y la caché en disco."""
+    return default_memo().fetch_json(url)
@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+from array import array
+
+import pokeapi_cache
+import pokeapi_names
+from pokeapi_async import BatchResolver
+from pokeapi_evolution import flatten_chain, nest_chain
+
+MIRROR_PATH = os.path.join(pokeapi_cache.CACHE_DIR, "dex_mirror.bin")
+MAGIC = b"PKDX1\n"
+COLUMNS = ("ids", "weights", "heights", "type1", "type2", "chains", "fingerprints")
+COLUMN_TYPES = {"ids": "i", "weights": "i", "heights": "i", "type1": "h", "type2": "h", "chains": "i", "fingerprints": "I"}
+
+
+class DexMirror:
+    """Copia local compacta de los campos que muestran las dos PokéDex.
+
+    Cada campo numérico se guarda como una columna ``array``; los nombres,
+    la tabla de tipos y las cadenas de evolución van en una cabecera JSON.
+    """
+
+    def __init__(self, names=None, types=None, chains=None, columns=None):
+        self.names = names or []
+        self.types = types or []
+        self.chains = chains or []
+        self.columns = columns or {col: array(COLUMN_TYPES[col]) for col in COLUMNS}
+        self._reindex()
+
+    def _reindex(self):
+        self.by_name = {name: row for row, name in enumerate(self.names)}
+        self.by_id = {pokemon_id: row for row, pokemon_id in enumerate(self.columns["ids"])}
+        self._type_codes = {name: code for code, name in enumerate(self.types)}
+        self._chain_codes = {json.dumps(stages): code for code, stages in enumerate(self.chains)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, query):
+        return self.row_for(query) is not None
+
+    def row_for(self, query):
+        """Devuelve la fila de un nombre o ID, o None si no está en la copia."""
+        query = str(query).strip().lower()
+        if query.isdigit():
+            return self.by_id.get(int(query))
+        return self.by_name.get(query)
+
+    def get_pokemon(self, query):
+        """Devuelve un documento con la forma de /pokemon/{id} (solo los campos mostrados)."""
+        row = self.row_for(query)
+        if row is None:
+            return None
+        cols = self.columns
+        types = [cols["type1"][row], cols["type2"][row]]
+        return {
+            "id": cols["ids"][row],
+            "name": self.names[row],
+            "weight": cols["weights"][row],
+            "height": cols["heights"][row],
+            "types": [
+                {"slot": slot, "type": {"name": self.types[code]}}
+                for slot, code in enumerate(types, 1) if code >= 0
+            ],
+        }
+
+    def get_evolution_chain(self, query):
+        """Devuelve un documento con la forma de /evolution-chain/{id}, o None."""
+        row = self.row_for(query)
+        if row is None or self.columns["chains"][row] < 0:
+            return None
+        return {"chain": nest_chain(self.chains[self.columns["chains"][row]])}
+
+    def _code(self, table, codes, value):
+        key = json.dumps(value) if table is self.chains else value
+        if key not in codes:
+            codes[key] = len(table)
+            table.append(value)
+        return codes[key]
+
+    def upsert(self, pokemon, evolution_chain=None):
+        """Añade o actualiza una fila; devuelve "added", "updated" o "unchanged"."""
+        type_names = [t["type"]["name"] for t in sorted(pokemon["types"], key=lambda t: t.get("slot", 0))]
+        type_codes = [self._code(self.types, self._type_codes, name) for name in type_names[:2]]
+        type_codes += [-1] * (2 - len(type_codes))
+        chain_code = -1
+        if evolution_chain:
+            chain_code = self._code(self.chains, self._chain_codes, flatten_chain(evolution_chain["chain"]))
+        values = {
+            "ids": pokemon["id"],
+            "weights": pokemon["weight"],
+            "heights": pokemon["height"],
+            "type1": type_codes[0],
+            "type2": type_codes[1],
+            "chains": chain_code,
+        }
+        values["fingerprints"] = zlib.crc32(json.dumps(
+            [pokemon["name"], values["ids"], values["weights"], values["heights"], type_names,
+             self.chains[chain_code] if chain_code >= 0 else None]
+        ).encode())
+
+        row = self.by_name.get(pokemon["name"])
+        if row is None:
+            self.names.append(pokemon["name"])
+            for col in COLUMNS:
+                self.columns[col].append(values[col])
+            row = len(self.names) - 1
+            self.by_name[pokemon["name"]] = row
+            self.by_id[values["ids"]] = row
+            return "added"
+        if self.columns["fingerprints"][row] == values["fingerprints"]:
+            return "unchanged"
+        for col in COLUMNS:
+            self.columns[col][row] = values[col]
+        self.by_id[values["ids"]] = row
+        return "updated"
+
+    def save(self, path=MIRROR_PATH):
+        """Escribe la copia en un único fichero binario de forma atómica."""
+        header = json.dumps({
+            "names": self.names,
+            "types": self.types,
+            "chains": self.chains,
+            "synced_at": time.time(),
+        }).encode()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for col in COLUMNS:
+                f.write(self.columns[col].tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=MIRROR_PATH):
+        """Carga una copia guardada; devuelve None si no existe o no es válida."""
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if not raw.startswith(MAGIC):
+            return None
+        # Un fichero truncado o corrupto se trata igual que uno inexistente
+        try:
+            offset = len(MAGIC)
+            (header_len,) = struct.unpack_from("<I", raw, offset)
+            offset += 4
+            header = json.loads(raw[offset:offset + header_len])
+            offset += header_len
+            rows = len(header["names"])
+            columns = {}
+            for col in COLUMNS:
+                column = array(COLUMN_TYPES[col])
+                size = rows * column.itemsize
+                column.frombytes(raw[offset:offset + size])
+                offset += size
+                if len(column) != rows:
+                    return None
+                columns[col] = column
+            return cls(header["names"], header["types"], header["chains"], columns)
+        except (struct.error, ValueError, KeyError, TypeError):
+            return None
+
+
+def revalidate_json(url):
+    """Pide la URL con una petición condicional aunque la caché no haya caducado."""
+    return pokeapi_cache.default_cache().fetch_json(url, max_age=0)
+
+
+def sync(mirror=None, refresh=False, concurrency=20, batch_size=200, path=MIRROR_PATH):
+    """Descarga a la copia local los pokémon que faltan.
+
+    Con ``refresh`` también vuelve a pedir los existentes: cada documento se
+    revalida con una petición condicional (un 304 no descarga el cuerpo) y
+    las cadenas se piden de nuevo en lugar de leerlas del índice de
+    evolución. Solo se reescriben las filas cuya huella cambió.
+    """
+    if mirror is None:
+        mirror = DexMirror.load(path) or DexMirror()
+    fetch = revalidate_json if refresh else None
+    names = list(pokeapi_names.iter_pokemon_names(fetch))
+    pending = names if refresh else [name for name in names if name not in mirror.by_name]
+
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    for start in range(0, len(pending), batch_size):
+        resolver = BatchResolver(concurrency, fetch, refresh_chains=refresh)
+        for result in asyncio.run(resolver.resolve_many(pending[start:start + batch_size])):
+            if result["pokemon"] is None:
+                counts["failed"] += 1
+                continue
+            counts[mirror.upsert(result["pokemon"], result["evolution_chain"])] += 1
+        mirror.save(path)  # Guardar por lotes para no perder el avance
+    if not pending:
+        mirror.save(path)
+    return mirror, counts
+
+
+_NOT_LOADED = object()
+_mirror = _NOT_LOADED
+
+
+def default_mirror():
+    """Devuelve la copia local del disco (cargada una sola vez), o None si no hay.
+
+    La ausencia de copia también se recuerda, para no reintentar abrir el
+    fichero en cada consulta.
+    """
+    global _mirror
+    if _mirror is _NOT_LOADED:
+        _mirror = DexMirror.load()
+    return _mirror
+
+
+def lookup(query):
+    """Resultado con la forma de ``BatchResolver.resolve`` servido desde la copia local.
+
+    Devuelve None si no hay copia o el pokémon no está en ella.
+    """
+    mirror = default_mirror()
+    if mirror is None or query not in mirror:
+        return None
+    return {
+        "query": str(query).strip().lower(),
+        "pokemon": mirror.get_pokemon(query),
+        "species": None,
+        "evolution_chain": mirror.get_evolution_chain(query),
+        "error": None,
+    }
+
+
+# Comando: python pokeapi_mirror.py [--refresh] [--concurrency N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga una copia local compacta de la PokéDex.")
+    parser.add_argument("--refresh", action="store_true", help="revalidar también las entradas existentes")
+    parser.add_argument("--concurrency", type=int, default=20, help="peticiones simultáneas")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    mirror, counts = sync(refresh=args.refresh, concurrency=args.concurrency)
+    print(
+        f"Copia local: {len(mirror)} pokémon en {MIRROR_PATH} "
+        f"({os.path.getsize(MIRROR_PATH) / 1024:.1f} KiB, {time.perf_counter() - started:.1f} s)"
+    )
+    print(", ".join(f"{key}: {value}" for key, value in counts.items()))
@@ -0,0 +1,48 @@
+import gzip
+import os
+
+import pokeapi_cache
+from pokeapi_client import API_URL
+
+PAGE_SIZE = 200
+
+# Instantánea comprimida de la lista de nombres (un nombre por línea)
+SNAPSHOT_PATH = os.path.join(pokeapi_cache.CACHE_DIR, "pokemon_names.txt.gz")
+
+
+def iter_name_pages(fetch=None, page_size=PAGE_SIZE):
+    """Itera la lista de pokémon página a página siguiendo los enlaces ``next``.
+
+    Solo hay una página decodificada en memoria a la vez; cada iteración
+    devuelve la lista de nombres de esa página.
+    """
+    fetch = fetch or pokeapi_cache.fetch_json
+    url = f"{API_URL}/pokemon?offset=0&limit={page_size}"
+    while url:
+        data = fetch(url)
+        yield [pokemon["name"] for pokemon in data["results"]]
+        url = data.get("next")
+
+
+def iter_pokemon_names(fetch=None, page_size=PAGE_SIZE):
+    """Itera los nombres de todos los pokémon a medida que llegan las páginas."""
+    for page in iter_name_pages(fetch, page_size):
+        yield from page
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Carga la última lista de nombres guardada; devuelve [] si no existe."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read().split()
+    except (OSError, EOFError):
+        return []
+
+
+def save_snapshot(names, path=SNAPSHOT_PATH):
+    """Guarda la lista de nombres de forma atómica para el próximo arranque."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(names))
+    os.replace(tmp_path, path)
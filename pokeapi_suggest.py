@@ -0,0 +1,284 @@
+import json
+import os
+import threading
+import timeit
+from bisect import bisect_left
+from collections import defaultdict
+from difflib import SequenceMatcher, get_close_matches
+from heapq import nlargest, nsmallest
+
+import pokeapi_cache
+
+INDEX_PATH = os.path.join(pokeapi_cache.CACHE_DIR, "suggest_index.json")
+INDEX_VERSION = 1
+
+
+def bigrams(word):
+    """Bigramas de la palabra con relleno para que los extremos cuenten."""
+    padded = f" {word} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class SuggestionIndex:
+    """Índice invertido de bigramas para sugerir nombres parecidos.
+
+    Los candidatos se preseleccionan por bigramas compartidos y después se
+    puntúan con ``SequenceMatcher``, igual que ``difflib.get_close_matches``,
+    de modo que el orden de las sugerencias es el mismo siempre que el nombre
+    correcto esté entre los ``max_candidates`` preseleccionados.
+    """
+
+    def __init__(self, names, postings=None, max_candidates=128):
+        self.names = []
+        self.max_candidates = max_candidates
+        self.source = None  # Lista a partir de la que se construyó (ver index_for)
+        if postings is None:
+            self.postings = {}
+            self.add(names)
+        else:
+            self.names = list(names)
+            self.postings = dict(postings)
+
+    def add(self, names):
+        """Añade nombres al índice sin reconstruirlo (p. ej. al llegar otra página)."""
+        for name in names:
+            idx = len(self.names)
+            self.names.append(name)
+            for gram in bigrams(name):
+                self.postings.setdefault(gram, []).append(idx)
+
+    def _candidates(self, word, cutoff):
+        grams = bigrams(word)
+        counts = defaultdict(int)
+        for gram in grams:
+            for idx in self.postings.get(gram, ()):
+                counts[idx] += 1
+        # Ratio máximo posible según las longitudes: 2*min / (la + lb)
+        length = len(word)
+        candidates = [
+            idx for idx in counts
+            if 2 * min(length, len(self.names[idx])) / (length + len(self.names[idx])) >= cutoff
+        ]
+        # Se priorizan los de mayor solapamiento relativo (coeficiente de Dice)
+        return nlargest(
+            self.max_candidates,
+            candidates,
+            key=lambda idx: counts[idx] / (len(grams) + len(self.names[idx]) + 1),
+        )
+
+    def suggest(self, word, n=5, cutoff=0.6):
+        """Devuelve hasta ``n`` nombres parecidos a ``word``, del más al menos similar."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        result = []
+        for idx in self._candidates(word, cutoff):
+            name = self.names[idx]
+            matcher.set_seq1(name)
+            if (matcher.real_quick_ratio() >= cutoff
+                    and matcher.quick_ratio() >= cutoff
+                    and matcher.ratio() >= cutoff):
+                result.append((matcher.ratio(), name))
+        return [name for score, name in nlargest(n, result)]
+
+    def save(self, path=INDEX_PATH):
+        """Guarda el índice en disco de forma atómica."""
+        data = json.dumps({"version": INDEX_VERSION, "names": self.names, "postings": self.postings})
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Carga un índice guardado con ``save``; devuelve None si no es válido."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return cls(data["names"], data["postings"])
+
+    @classmethod
+    def load_or_build(cls, names, path=INDEX_PATH, save=True):
+        """Reutiliza el índice del disco si corresponde a ``names``; si no, lo construye.
+
+        Con ``save=False`` (lista aún incompleta) el índice construido no se guarda.
+        """
+        index = cls.load(path)
+        if index is None or index.names != list(names):
+            index = cls(names)
+            if save:
+                index.save_quietly(path)
+        return index
+
+    def save_quietly(self, path=INDEX_PATH):
+        """Como ``save``, pero un fallo al escribir no interrumpe la búsqueda."""
+        try:
+            self.save(path)
+        except OSError:
+            pass
+
+
+class PrefixIndex:
+    """Lista ordenada de nombres para autocompletar por prefijo con búsqueda binaria."""
+
+    def __init__(self, names):
+        self.names = sorted(set(names))
+        self.source = None  # Lista a partir de la que se construyó (ver prefix_index_for)
+
+    def add(self, names):
+        """Inserta nombres manteniendo el orden.
+
+        La lista se sustituye entera en lugar de modificarse, para que una
+        consulta concurrente vea siempre una lista ordenada completa.
+        """
+        self.names = sorted(set(self.names).union(names))
+
+    def complete(self, prefix, n=5):
+        """Hasta ``n`` nombres que empiezan por ``prefix``, los más cortos primero."""
+        names = self.names
+        # Todos los nombres con el prefijo forman un tramo contiguo de la lista
+        start = bisect_left(names, prefix)
+        end = bisect_left(names, prefix + "\uffff", start)
+        return nsmallest(n, names[start:end], key=lambda name: (len(name), name))
+
+
+# Últimos índices publicados. Solo los construye o amplía quien publica la
+# lista de nombres (index_for / prefix_index_for, bajo _lock); suggest y
+# complete leen la referencia ya publicada sin bloquearse. Los índices solo
+# crecen añadiendo al final o sustituyendo listas, así que leerlos mientras
+# se amplían es seguro. Una lista sin relación con la publicada se atiende
+# con un índice aparte (_private_*) que no se publica ni se guarda.
+_lock = threading.Lock()
+_index = None
+_prefix_index = None
+_private_index = None
+_private_prefix_index = None
+
+
+def _extends(names, source):
+    # La lista nueva continúa la ya indexada (carga paginada en curso)
+    return source is not None and len(names) > len(source) and names[len(source) - 1:len(source)] == source[-1:]
+
+
+def _covers(source, names):
+    # ``names`` es la lista indexada o una anterior de la misma carga paginada
+    if source is names:
+        return True
+    return source is not None and 0 < len(names) <= len(source) and (
+        source[0] == names[0] and source[len(names) - 1] == names[-1]
+    )
+
+
+def index_for(names, complete=True):
+    """Publica y devuelve el índice de la lista de nombres, construyéndolo una sola vez.
+
+    Si ``names`` amplía la lista ya indexada, solo se añaden los nombres nuevos.
+    El índice se guarda en disco cuando ``complete`` indica que la lista ya
+    está entera, no con cada página de una carga paginada.
+    """
+    global _index
+    with _lock:
+        if _index is not None and _index.source is not names and _index.source == names:
+            # La misma lista en otro objeto (p. ej. la última página de la carga)
+            _index.source = names
+            if complete:
+                _index.save_quietly()
+        elif _index is not None and _index.source is not names and _extends(names, _index.source):
+            _index.add(names[len(_index.source):])
+            _index.source = names
+            if complete:
+                _index.save_quietly()
+        elif _index is None or _index.source is not names:
+            index = SuggestionIndex.load_or_build(names, save=complete)
+            index.source = names
+            _index = index
+        return _index
+
+
+def suggest(name, all_names, n=5, cutoff=0.6):
+    """Sustituto indexado de ``get_close_matches(name, all_names, n, cutoff)``.
+
+    Si ``all_names`` es la lista publicada (o una página anterior de ella) se
+    usa el índice publicado, que puede incluir nombres más recientes; si no
+    hay ninguno publicado, se construye y publica. Cualquier otra lista se
+    indexa aparte sin tocar el índice publicado.
+    """
+    global _private_index
+    if not all_names:
+        return []
+    index = _index
+    if index is None:
+        index = index_for(all_names)
+    elif not _covers(index.source, all_names):
+        index = _private_index
+        if index is None or index.source is not all_names:
+            index = SuggestionIndex(all_names)
+            index.source = all_names
+            _private_index = index
+    return index.suggest(name, n=n, cutoff=cutoff)
+
+
+def prefix_index_for(names):
+    """Publica y devuelve el índice de prefijos de la lista de nombres, construyéndolo una sola vez."""
+    global _prefix_index
+    with _lock:
+        if _prefix_index is not None and _prefix_index.source is not names and _extends(names, _prefix_index.source):
+            _prefix_index.add(names[len(_prefix_index.source):])
+            _prefix_index.source = names
+        elif _prefix_index is None or _prefix_index.source is not names:
+            index = PrefixIndex(names)
+            index.source = names
+            _prefix_index = index
+        return _prefix_index
+
+
+def complete(prefix, all_names, n=5):
+    """Autocompletado: nombres de ``all_names`` que empiezan por ``prefix``.
+
+    Usa el índice publicado con las mismas reglas que ``suggest``.
+    """
+    global _private_prefix_index
+    if not prefix or not all_names:
+        return []
+    index = _prefix_index
+    if index is None:
+        index = prefix_index_for(all_names)
+    elif not _covers(index.source, all_names):
+        index = _private_prefix_index
+        if index is None or index.source is not all_names:
+            index = PrefixIndex(all_names)
+            index.source = all_names
+            _private_prefix_index = index
+    return index.complete(prefix, n=n)
+
+
+# Micro-benchmark: índice de bigramas frente a difflib.get_close_matches
+if __name__ == "__main__":
+    import pokeapi_names
+
+    all_names = list(pokeapi_names.iter_pokemon_names())
+    queries = ["pikachu", "pikachuu", "charmandr", "bulbasor", "mewtwoo", "garchom", "eevee", "zzzz"]
+
+    build = timeit.timeit(lambda: SuggestionIndex(all_names), number=5) / 5
+    index = SuggestionIndex(all_names)
+    repeat = 20
+    t_difflib = timeit.timeit(
+        lambda: [get_close_matches(q, all_names, n=5, cutoff=0.6) for q in queries], number=repeat
+    )
+    t_index = timeit.timeit(lambda: [index.suggest(q) for q in queries], number=repeat)
+    same = sum(index.suggest(q) == get_close_matches(q, all_names, n=5, cutoff=0.6) for q in queries)
+
+    per_query = repeat * len(queries)
+    print(f"Nombres: {len(all_names)}  construcción del índice: {build * 1000:.1f} ms")
+    print(f"difflib: {t_difflib / per_query * 1000:.3f} ms/consulta")
+    print(f"índice:  {t_index / per_query * 1000:.3f} ms/consulta  ({t_difflib / t_index:.1f}x)")
+    print(f"Resultados idénticos: {same}/{len(queries)}")
+
+    prefixes = ["p", "pi", "char", "bulb", "mew", "zz"]
+    prefix_index = PrefixIndex(all_names)
+    t_prefix = timeit.timeit(lambda: [prefix_index.complete(p) for p in prefixes], number=repeat)
+    print(f"autocompletado: {t_prefix / (repeat * len(prefixes)) * 1e6:.1f} µs/consulta")
@@ -0,0 +1,129 @@
+import functools
+import json
+import socket
+import threading
+import time
+
+# Trazas desactivadas por defecto: span() devuelve un objeto nulo compartido y
+# traced() solo añade una comprobación de un booleano por llamada.
+_enabled = False
+_lock = threading.Lock()
+_spans = []  # (nombre, inicio, duración, bytes, hilo)
+_original_getaddrinfo = socket.getaddrinfo
+
+
+class _Span:
+    __slots__ = ("name", "start", "bytes")
+
+    def __init__(self, name):
+        self.name = name
+        self.bytes = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        with _lock:
+            _spans.append((self.name, self.start, duration, self.bytes, threading.get_ident()))
+        return False
+
+
+class _NullSpan:
+    # Compartido por todas las llamadas con el trazado apagado: sin atributos propios
+    __slots__ = ()
+    bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Contexto que mide un tramo; asigna ``.bytes`` para anotar bytes transferidos."""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def traced(name):
+    """Decorador que mide cada llamada a la función como un tramo ``name``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _timed_getaddrinfo(*args, **kwargs):
+    with span("dns"):
+        return _original_getaddrinfo(*args, **kwargs)
+
+
+def enable():
+    """Activa las trazas (incluida la resolución DNS de las conexiones nuevas)."""
+    global _enabled
+    _enabled = True
+    socket.getaddrinfo = _timed_getaddrinfo
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    socket.getaddrinfo = _original_getaddrinfo
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Descarta los tramos registrados (p. ej. al empezar una búsqueda)."""
+    with _lock:
+        _spans.clear()
+
+
+def spans():
+    with _lock:
+        return list(_spans)
+
+
+def summary():
+    """Agrupa los tramos por nombre: llamadas, tiempo total y máximo, y bytes."""
+    totals = {}
+    for name, _, duration, size, _ in spans():
+        entry = totals.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0})
+        entry["calls"] += 1
+        entry["total_ms"] += duration * 1000
+        entry["max_ms"] = max(entry["max_ms"], duration * 1000)
+        entry["bytes"] += size
+    return dict(sorted(totals.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def format_summary():
+    """Resumen en texto plano, una línea por tramo."""
+    lines = [f"{'Tramo':<24}{'Llamadas':>9}{'Total ms':>11}{'Máx ms':>10}{'Bytes':>10}"]
+    for name, entry in summary().items():
+        lines.append(
+            f"{name:<24}{entry['calls']:>9}{entry['total_ms']:>11.2f}{entry['max_ms']:>10.2f}{entry['bytes']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def write_chrome_trace(path):
+    """Guarda los tramos en formato Trace Event (chrome://tracing, Perfetto)."""
+    events = [
+        {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": 1, "tid": thread,
+         "args": {"bytes": size}}
+        for name, start, duration, size, thread in spans()
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events}, f)
@@ -0,0 +1,30 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Los módulos leen la URL de la API y el directorio de caché al importarse,
+# así que el servidor local y el directorio temporal se preparan antes
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pokeapi_fixture_server import FixtureServer  # noqa: E402
+
+_server = FixtureServer().start()
+_cache_dir = tempfile.mkdtemp(prefix="pokedex-tests-")
+os.environ.update(
+    POKEAPI_URL=_server.url,
+    POKEDEX_CACHE_DIR=_cache_dir,
+    YT_CACHE_DIR=os.path.join(_cache_dir, "yt"),
+)
+
+
+@pytest.fixture(scope="session")
+def server():
+    """PokéAPI local compartida por todas las pruebas (los contadores se comparan por diferencia)."""
+    yield _server
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _server.stop()
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from pokeapi_async import BatchResolver
+from pokeapi_client import PokeAPIClient
+from pokeapi_evolution import EvolutionIndex
+
+
+def json_fetcher(calls=None):
+    client = PokeAPIClient()
+
+    def fetch(url):
+        if calls is not None:
+            calls.append(url)
+        response = client.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    return fetch
+
+
+def test_resolver_downloads_each_chain_once(server):
+    calls = []
+    resolver = BatchResolver(concurrency=8, fetch=json_fetcher(calls), evolution_index=EvolutionIndex())
+    results = asyncio.run(resolver.resolve_many(["bulbasaur", "ivysaur", "venusaur", "4", "pikachu", "nope"]))
+
+    assert [r["pokemon"]["name"] if r["pokemon"] else None for r in results] == [
+        "bulbasaur", "ivysaur", "venusaur", "charmander", "pikachu", None
+    ]
+    assert results[-1]["error"] is not None
+    chains = [url for url in calls if "/evolution-chain/" in url]
+    assert len(chains) == len(set(chains)) == 3
+
+
+def test_resolver_skips_chains_already_indexed(server):
+    index = EvolutionIndex()
+    asyncio.run(BatchResolver(fetch=json_fetcher(), evolution_index=index).resolve_many(["eevee"]))
+    calls = []
+    results = asyncio.run(BatchResolver(fetch=json_fetcher(calls), evolution_index=index).resolve_many(["vaporeon"]))
+
+    assert results[0]["evolution_chain"] is not None
+    assert not [url for url in calls if "/evolution-chain/" in url]
+
+
+def test_resolve_stream_does_not_wait_for_slow_input(server):
+    def queries():
+        yield "pikachu"
+        yield "raichu"
+        time.sleep(1)
+        yield "eevee"
+
+    async def main():
+        started = time.monotonic()
+        resolver = BatchResolver(fetch=json_fetcher(), evolution_index=EvolutionIndex())
+        return [(r["query"], time.monotonic() - started) async for r in resolver.resolve_stream(queries())]
+
+    arrivals = dict(asyncio.run(main()))
+    assert set(arrivals) == {"pikachu", "raichu", "eevee"}
+    assert arrivals["pikachu"] < 0.9 and arrivals["raichu"] < 0.9
+    assert arrivals["eevee"] >= 1
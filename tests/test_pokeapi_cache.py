@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pokeapi_cache
+from pokeapi_client import PokeAPIClient
+
+
+def make_cache(tmp_path, **kwargs):
+    return pokeapi_cache.ResponseCache(
+        path=str(tmp_path / "responses.sqlite3"), http_get=PokeAPIClient().get, **kwargs
+    )
+
+
+def test_cache_revalidates_stale_entries_with_etag(server, tmp_path):
+    cache = make_cache(tmp_path, ttl_for=lambda url: 0)
+    url = f"{server.url}/pokemon/25/"
+    before = server.counters["not_modified"]
+    first = cache.fetch_json(url)
+    second = cache.fetch_json(url)
+
+    assert first == second and first["name"] == "pikachu"
+    assert server.counters["not_modified"] == before + 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["revalidated"], stats["entries"]) == (1, 1, 1)
+
+
+def test_cache_serves_fresh_entries_without_network(server, tmp_path):
+    cache = make_cache(tmp_path)
+    url = f"{server.url}/pokemon/1/"
+    cache.fetch_json(url)
+    before = server.counters["requests"]
+    assert cache.fetch_json(url)["name"] == "bulbasaur"
+    assert server.counters["requests"] == before
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_counts_every_lookup_from_many_threads(server, tmp_path):
+    cache = make_cache(tmp_path)
+    urls = [f"{server.url}/pokemon/{pokemon_id}/" for pokemon_id in (1, 4, 7, 25)]
+    for url in urls:
+        cache.fetch_json(url)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(cache.fetch_json, urls * 50))
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"]) == (4, 200)
+    assert stats["hit_ratio"] == 200 / 204
@@ -0,0 +1,37 @@
+import requests
+
+from pokeapi_fixture_server import FixtureServer
+
+
+def test_documents_are_served_by_name_and_id_with_local_urls(server):
+    by_name = requests.get(f"{server.url}/pokemon/pikachu/").json()
+    by_id = requests.get(f"{server.url}/pokemon/25/").json()
+    assert by_name == by_id
+    assert by_name["species"]["url"].startswith(server.url)
+    assert requests.get(f"{server.url}/pokemon/missingno/").status_code == 404
+
+
+def test_listing_is_paginated(server):
+    page = requests.get(f"{server.url}/pokemon?offset=0&limit=5").json()
+    assert len(page["results"]) == 5 and page["previous"] is None
+    count, names = page["count"], [p["name"] for p in page["results"]]
+    while page["next"]:
+        page = requests.get(page["next"]).json()
+        assert page["previous"] is not None
+        names += [p["name"] for p in page["results"]]
+    assert len(names) == count == len(set(names))
+
+
+def test_etag_revalidation(server):
+    response = requests.get(f"{server.url}/pokemon/1/")
+    again = requests.get(f"{server.url}/pokemon/1/", headers={"If-None-Match": response.headers["ETag"]})
+    assert (again.status_code, again.content) == (304, b"")
+
+
+def test_injected_errors_and_rate_limits():
+    with FixtureServer(rate_limit_rate=1, retry_after=7) as limited:
+        response = requests.get(f"{limited.url}/pokemon/1/")
+        assert (response.status_code, response.headers["Retry-After"]) == (429, "7")
+    with FixtureServer(error_rate=1) as failing:
+        assert requests.get(f"{failing.url}/pokemon/1/").status_code == 500
+        assert failing.counters["errors"] == 1
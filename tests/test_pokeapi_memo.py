@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import pokeapi_memo
+
+
+def slow_fetch(calls, delay=0.2):
+    def fetch(url):
+        calls.append(url)
+        time.sleep(delay)
+        return {"url": url}
+
+    return fetch
+
+
+def test_memo_coalesces_concurrent_threads():
+    calls = []
+    memo = pokeapi_memo.MemoFetcher(fetch=slow_fetch(calls))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(memo.fetch_json("a"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["a"]
+    assert results == [{"url": "a"}] * 8
+    stats = memo.stats()
+    assert (stats["misses"], stats["coalesced"], stats["in_flight"]) == (1, 7, 0)
+
+
+def test_memo_coalesces_coroutines_and_does_not_keep_errors():
+    calls = []
+    memo = pokeapi_memo.MemoFetcher(fetch=slow_fetch(calls))
+
+    async def main():
+        return await asyncio.gather(*(memo.fetch_json_async("b") for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"url": "b"}] * 5
+    assert calls == ["b"]
+
+    def failing(url):
+        calls.append(url)
+        raise ValueError(url)
+
+    memo = pokeapi_memo.MemoFetcher(fetch=failing)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            memo.fetch_json("c")
+    assert calls.count("c") == 2
@@ -0,0 +1,47 @@
+import pokeapi_mirror
+from pokeapi_mirror import DexMirror
+
+
+def test_save_and_load_round_trip(server, tmp_path):
+    path = str(tmp_path / "dex_mirror.bin")
+    mirror, counts = pokeapi_mirror.sync(DexMirror(), path=path)
+    assert counts["added"] == len(mirror) > 0 and counts["failed"] == 0
+
+    loaded = DexMirror.load(path)
+    assert loaded.names == mirror.names
+    for query in ("pikachu", "25", "charizard", "eevee"):
+        assert loaded.get_pokemon(query) == mirror.get_pokemon(query)
+        assert loaded.get_evolution_chain(query) == mirror.get_evolution_chain(query)
+    pikachu = loaded.get_pokemon("pikachu")
+    assert (pikachu["id"], [t["type"]["name"] for t in pikachu["types"]]) == (25, ["electric"])
+
+
+def test_load_rejects_truncated_files(tmp_path):
+    path = str(tmp_path / "dex_mirror.bin")
+    DexMirror().save(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    for cut in (len(pokeapi_mirror.MAGIC) + 2, len(raw) - 3):
+        with open(path, "wb") as f:
+            f.write(raw[:cut])
+        assert DexMirror.load(path) is None
+
+
+def test_refresh_revalidates_and_rewrites_only_changed_rows(server, tmp_path, monkeypatch):
+    path = str(tmp_path / "dex_mirror.bin")
+    mirror, _ = pokeapi_mirror.sync(DexMirror(), path=path)
+
+    before = server.counters["not_modified"]
+    mirror, counts = pokeapi_mirror.sync(mirror, refresh=True, path=path)
+    assert counts["updated"] == 0 and counts["unchanged"] == len(mirror)
+    assert server.counters["not_modified"] > before
+
+    # Cambios en el servidor: el peso de pikachu y la cadena de eevee
+    monkeypatch.setitem(server.store.documents["pokemon/25"], "weight", 61)
+    chain = server.store.documents["evolution-chain/67"]["chain"]
+    monkeypatch.setitem(chain, "evolves_to", chain["evolves_to"][:1])
+    mirror, counts = pokeapi_mirror.sync(mirror, refresh=True, path=path)
+
+    eevee_family = [name for name in mirror.names if name in ("eevee", "vaporeon", "jolteon", "flareon")]
+    assert counts["updated"] == 1 + len(eevee_family)
+    assert DexMirror.load(path).get_pokemon("pikachu")["weight"] == 61
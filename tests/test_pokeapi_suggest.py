@@ -0,0 +1,93 @@
+from difflib import get_close_matches
+
+import pytest
+
+import pokeapi_suggest
+from pokeapi_suggest import PrefixIndex, SuggestionIndex
+
+NAMES = [
+    "bulbasaur", "ivysaur", "venusaur", "charmander", "charmeleon", "charizard", "squirtle", "wartortle",
+    "blastoise", "caterpie", "metapod", "butterfree", "pidgey", "pidgeotto", "pidgeot", "rattata",
+    "raticate", "pikachu", "raichu", "pichu", "sandshrew", "nidoran-f", "nidoran-m", "clefairy",
+    "vulpix", "ninetales", "jigglypuff", "zubat", "golbat", "oddish", "gloom", "vileplume", "eevee",
+    "vaporeon", "jolteon", "flareon", "mewtwo", "mew", "garchomp", "gible", "charizard-mega-x",
+]
+
+
+@pytest.mark.parametrize("word", ["pikachuu", "charmandr", "bulbasor", "mewtwoo", "eevee", "pidgy", "zzzz", "nidoran"])
+def test_suggestions_match_difflib(word):
+    assert SuggestionIndex(NAMES).suggest(word) == get_close_matches(word, NAMES, n=5, cutoff=0.6)
+
+
+def test_incremental_add_matches_full_build():
+    index = SuggestionIndex(NAMES[:10])
+    index.add(NAMES[10:])
+    assert index.names == NAMES
+    assert index.suggest("pikachuu") == SuggestionIndex(NAMES).suggest("pikachuu")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "suggest_index.json")
+    SuggestionIndex(NAMES).save(path)
+    loaded = SuggestionIndex.load(path)
+
+    assert loaded.names == NAMES
+    assert loaded.suggest("charmandr") == get_close_matches("charmandr", NAMES, n=5, cutoff=0.6)
+    assert [p.name for p in tmp_path.iterdir()] == ["suggest_index.json"]  # Sin temporales
+
+
+def test_load_or_build_rebuilds_for_another_list(tmp_path):
+    path = str(tmp_path / "suggest_index.json")
+    SuggestionIndex(NAMES[:5]).save(path)
+    index = SuggestionIndex.load_or_build(NAMES, path)
+    assert index.names == NAMES
+    assert SuggestionIndex.load(path).names == NAMES
+    assert SuggestionIndex.load_or_build(NAMES[:3], path, save=False).names == NAMES[:3]
+    assert SuggestionIndex.load(path).names == NAMES
+
+
+@pytest.fixture
+def fresh_indexes(monkeypatch):
+    # El índice guardado va al directorio temporal de conftest (POKEDEX_CACHE_DIR)
+    for attr in ("_index", "_prefix_index", "_private_index", "_private_prefix_index"):
+        monkeypatch.setattr(pokeapi_suggest, attr, None)
+
+
+def test_suggest_uses_the_published_index_for_older_pages(fresh_indexes):
+    first_page = NAMES[:20]
+    pokeapi_suggest.index_for(first_page, complete=False)
+    pokeapi_suggest.prefix_index_for(first_page)
+    pokeapi_suggest.index_for(list(NAMES))
+    pokeapi_suggest.prefix_index_for(list(NAMES))
+    published = pokeapi_suggest._index
+
+    # Quien aún tiene la primera página ve también los nombres nuevos
+    assert pokeapi_suggest.suggest("mewtwoo", first_page) == ["mewtwo", "mew"]
+    assert pokeapi_suggest.complete("gar", first_page) == ["garchomp"]
+    assert pokeapi_suggest._index is published
+
+
+def test_suggest_indexes_unrelated_lists_separately(fresh_indexes):
+    assert pokeapi_suggest.suggest("pikachuu", ["pikachu", "raichu"]) == ["pikachu"]
+    published = pokeapi_suggest._index
+    assert pokeapi_suggest.suggest("bulbasaur", ["bulbasaur", "ivysaur"]) == ["bulbasaur"]
+    assert pokeapi_suggest.complete("ivy", ["bulbasaur", "ivysaur"]) == ["ivysaur"]
+    assert pokeapi_suggest._index is published
+
+
+@pytest.mark.parametrize("prefix", ["p", "pi", "char", "nidoran", "mew", "zz", "v"])
+def test_prefix_completion_matches_a_full_scan(prefix):
+    expected = sorted((name for name in NAMES if name.startswith(prefix)), key=lambda name: (len(name), name))[:5]
+    assert PrefixIndex(NAMES).complete(prefix) == expected
+
+
+def test_prefix_completion_ranks_every_match_by_length():
+    names = ["pa" + "x" * i + "z" * 30 for i in range(79)] + ["pz", "q"]
+    assert PrefixIndex(names).complete("p", n=2) == ["pz", "pa" + "z" * 30]
+
+
+def test_prefix_index_add_keeps_order_and_drops_duplicates():
+    index = PrefixIndex(NAMES[:10])
+    index.add(NAMES[5:] + ["pikachu"])
+    assert index.names == sorted(set(NAMES))
+
@@ -0,0 +1,24 @@
+import wave
+
+import pytest
+
+pytest.importorskip("numpy")
+import yt_audio  # noqa: E402
+
+RATE = 100
+
+
+@pytest.mark.parametrize("width, left, right, mono", [(1, 255, 1, 128), (2, 100, -300, -100), (3, 1000, -3000, -1000)])
+def test_wav_windows_downmix_every_sample_width(tmp_path, width, left, right, mono):
+    signed = width > 1
+    frame = left.to_bytes(width, "little", signed=signed) + right.to_bytes(width, "little", signed=signed)
+    wav_path = str(tmp_path / "stereo.wav")
+    with wave.open(wav_path, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(width)
+        wav_file.setframerate(RATE)
+        wav_file.writeframes(frame * RATE)
+
+    [(index, start, frames, rate, sample_width)] = yt_audio.iter_wav_windows(wav_path, window_s=2, overlap_s=1)
+    assert (rate, sample_width, len(frames)) == (RATE, width, RATE * width)
+    assert int.from_bytes(frames[:width], "little", signed=signed) == mono
@@ -0,0 +1,76 @@
+import itertools
+import os
+
+import pytest
+
+import yt_cache
+from yt_cache import ArtifactCache, artifact_key
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    # Reloj que avanza un segundo en cada lectura: el orden de uso queda definido
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(yt_cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_keys_depend_on_stage_and_every_parameter():
+    key = artifact_key("resumen", source="abc", model="m", lang="es")
+    assert key == artifact_key("resumen", lang="es", model="m", source="abc")
+    assert key != artifact_key("resumen", source="abc", model="otro", lang="es")
+    assert key != artifact_key("traducción", source="abc", model="m", lang="es")
+
+
+def test_text_is_computed_once_and_invalid_results_are_not_stored(tmp_path):
+    cache = ArtifactCache(root=str(tmp_path))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "resultado"
+
+    assert cache.text("resumen", {"source": "abc"}, compute) == "resultado"
+    assert cache.text("resumen", {"source": "abc"}, compute) == "resultado"
+    assert len(calls) == 1
+
+    cache.text("nota", {"source": "abc"}, lambda: "Error al resumir", valid=lambda text: not text.startswith("Error"))
+    assert cache.get_text(artifact_key("nota", source="abc")) is None
+
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path):
+    cache = ArtifactCache(root=str(tmp_path), max_bytes=300)
+    for name in ("a", "b", "c"):
+        cache.put_text(name, name * 100, "prueba")
+    # "a" se usó después que "b": al pasarse del límite se borra "b"
+    assert cache.get_text("a") == "a" * 100
+    cache.put_text("d", "d" * 40, "prueba")
+
+    assert cache.get_text("b") is None
+    assert cache.get_text("a") is not None and cache.get_text("d") is not None
+    assert cache.stats()["bytes"] <= 300
+
+
+def test_an_oversized_artifact_is_kept_until_the_next_one(tmp_path):
+    cache = ArtifactCache(root=str(tmp_path), max_bytes=50)
+    path = cache.put_text("grande", "x" * 100, "prueba")
+    assert os.path.exists(path) and cache.get_text("grande") == "x" * 100
+    cache.put_text("otro", "y" * 10, "prueba")
+    assert not os.path.exists(path)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_force_recomputes_but_still_stores(tmp_path):
+    ArtifactCache(root=str(tmp_path)).put_text(artifact_key("resumen", source="abc"), "viejo", "resumen")
+    forced = ArtifactCache(root=str(tmp_path), force=True)
+    assert forced.text("resumen", {"source": "abc"}, lambda: "nuevo") == "nuevo"
+    assert forced.stats()["hits"] == 0
+    assert ArtifactCache(root=str(tmp_path)).get_text(artifact_key("resumen", source="abc")) == "nuevo"
+
+
+def test_put_file_moves_into_the_cache(tmp_path):
+    source = tmp_path / "audio.webm"
+    source.write_bytes(b"audio")
+    cache = ArtifactCache(root=str(tmp_path / "cache"))
+    path = cache.put_file("descarga", str(source), "descarga", move=True)
+    assert not source.exists() and path.endswith(".webm")
+    assert cache.get_file("descarga") == path
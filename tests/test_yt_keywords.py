@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from yt_keywords import KeywordIndex, tokenize  # noqa: E402
+
+CORPUS = [
+    "Python asyncio coroutines and event loops explained with Python examples",
+    "Whisper transcription of long audio with Python and numpy",
+    "Resumen de la charla sobre redes neuronales y transcripción automática",
+    "Event loops, threads and processes: concurrency in Python",
+]
+TEXT = "Whisper transcribes audio; asyncio event loops schedule the audio transcription jobs"
+
+
+def tfidf_keywords(corpus, text, num_keywords):
+    # Referencia: TfidfVectorizer ajustado con el corpus más el texto
+    vectorizer = TfidfVectorizer(tokenizer=tokenize, lowercase=False, token_pattern=None)
+    row = vectorizer.fit_transform(corpus + [text])[-1].toarray()[0]
+    terms = vectorizer.get_feature_names_out()
+    scores = {terms[i]: row[i] for i in row.nonzero()[0]}
+    return sorted(scores, key=lambda term: (-round(scores[term], 12), term))[:num_keywords]
+
+
+def test_keywords_match_a_vectorizer_fitted_on_the_whole_corpus(tmp_path):
+    index = KeywordIndex(str(tmp_path / "keywords.sqlite3"))
+    for i, text in enumerate(CORPUS):
+        index.add_document(f"doc{i}", text)
+    assert index.keywords(TEXT, 6) == tfidf_keywords(CORPUS, TEXT, 6)
+
+
+def test_document_frequencies_follow_updates_and_removals(tmp_path):
+    index = KeywordIndex(str(tmp_path / "keywords.sqlite3"))
+    for i, text in enumerate(CORPUS):
+        index.add_document(f"doc{i}", text)
+    assert index.add_document("doc0", CORPUS[0]) is False
+
+    corpus = list(CORPUS)
+    corpus[0] = "Cooking pasta with tomato sauce"
+    assert index.add_document("doc0", corpus[0]) is True
+    index.remove_document("doc3")
+    del corpus[3]
+    assert index.document_count() == 3
+    assert index.keywords(TEXT, 6) == tfidf_keywords(corpus, TEXT, 6)
+
+
+def test_sync_reads_only_new_or_changed_notes(tmp_path):
+    notes = tmp_path / "notas"
+    notes.mkdir()
+    for i, text in enumerate(CORPUS[:3]):
+        (notes / f"nota{i}.md").write_text(text, encoding="utf-8")
+    (notes / "nota9.partial.md").write_text("en curso", encoding="utf-8")
+    index = KeywordIndex(str(tmp_path / "keywords.sqlite3"))
+
+    assert index.sync(str(notes)) == 3
+    assert index.sync(str(notes)) == 0
+
+    changed = notes / "nota1.md"
+    changed.write_text(CORPUS[3], encoding="utf-8")
+    os.utime(changed, (1, 1))
+    os.remove(notes / "nota2.md")
+    assert index.sync(str(notes)) == 2
+    assert index.document_count() == 2
+    assert index.keywords(TEXT, 6) == tfidf_keywords([CORPUS[0], CORPUS[3]], TEXT, 6)
@@ -0,0 +1,45 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yt_models
+
+
+class FakeWhisper:
+    """Modelo de prueba que detecta inferencias simultáneas en la misma instancia."""
+
+    loads = 0
+
+    def __init__(self, name):
+        FakeWhisper.loads += 1
+        self.active = 0
+        self.overlaps = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.overlaps += self.active > 1
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return {"text": audio, "segments": [{"start": 0.0, "end": 1.0, "text": audio}], "language": "en"}
+
+
+def test_concurrent_jobs_never_share_a_model_instance():
+    FakeWhisper.loads = 0
+    registry = yt_models.ModelRegistry({"whisper": FakeWhisper})
+    jobs = [{"op": "transcribe", "model": "fake", "audio": f"job{i}"} for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda job: yt_models.run_job(job, registry), jobs))
+
+    assert [result["text"] for result in results] == [job["audio"] for job in jobs]
+    assert FakeWhisper.loads == 1
+    assert registry.get("whisper", "fake").overlaps == 0
+
+
+def test_unload_and_status():
+    registry = yt_models.ModelRegistry({"whisper": FakeWhisper})
+    yt_models.run_job({"op": "transcribe", "model": "a", "audio": "x"}, registry)
+    assert yt_models.run_job({"op": "status"}, registry)["loaded"] == [["whisper", "a"]]
+    assert yt_models.run_job({"op": "unload", "kind": "whisper"}, registry)["loaded"] == []
@@ -0,0 +1,60 @@
+import yt_summarize
+
+
+class WordTokenizer:
+    """Tokenizador de prueba: un token por palabra."""
+
+    def __init__(self):
+        self.vocab = {}
+
+    def __call__(self, pieces, add_special_tokens=False):
+        return {"input_ids": [[self.vocab.setdefault(w, len(self.vocab)) for w in p.split()] for p in pieces]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        words = {index: word for word, index in self.vocab.items()}
+        return " ".join(words[i] for i in ids)
+
+
+class StubSummarizer:
+    """Resume cada trozo con sus tres primeras palabras y anota el tamaño de las entradas."""
+
+    def __init__(self):
+        self.tokenizer = WordTokenizer()
+        self.inputs = []
+
+    def __call__(self, pieces, **kwargs):
+        self.inputs.append([len(piece.split()) for piece in pieces])
+        return [{"summary_text": " ".join(piece.split()[:3]) + "."} for piece in pieces]
+
+
+def test_chunks_respect_the_token_budget():
+    sentences = ["uno dos tres.", "cuatro cinco.", "seis siete ocho nueve.", "diez."]
+    chunks = yt_summarize.chunk_by_tokens(sentences, [3, 2, 4, 1], chunk_tokens=5)
+    assert chunks == ["uno dos tres. cuatro cinco.", "seis siete ocho nueve. diez."]
+
+
+def test_oversized_sentences_are_split_in_order():
+    tokenizer = WordTokenizer()
+    sentences = ["corta.", " ".join(f"w{i}" for i in range(12))]
+    pieces = yt_summarize.split_oversized(
+        sentences, tokenizer(sentences)["input_ids"], tokenizer.decode, chunk_tokens=5
+    )
+    assert pieces == ["corta.", "w0 w1 w2 w3 w4", "w5 w6 w7 w8 w9", "w10 w11"]
+
+
+def test_unpunctuated_text_is_summarized_in_full():
+    summarizer = StubSummarizer()
+    text = " ".join(f"palabra{i}" for i in range(5000))
+    summary = yt_summarize.summarize_long(summarizer, text, chunk_tokens=900)
+
+    map_inputs = summarizer.inputs[0]
+    assert sum(map_inputs) == 5000
+    assert max(map_inputs) <= 900
+    assert all(size <= 900 for sizes in summarizer.inputs for size in sizes)
+    assert summary.startswith("palabra0")
+
+
+def test_short_text_is_summarized_in_one_pass():
+    summarizer = StubSummarizer()
+    yt_summarize.summarize_long(summarizer, "Una frase. Otra frase.", chunk_tokens=900)
+    assert summarizer.inputs == [[4]]
@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+import yt_audio  # noqa: E402
+import yt_models  # noqa: E402
+import yt_transcribe  # noqa: E402
+
+RATE = 1000
+
+
+def bursts(count=5, speech_s=3, silence_s=2.5, seed=0):
+    """Ráfagas de ruido separadas por silencios largos; devuelve (muestras, límites de cada ráfaga)."""
+    rng = np.random.default_rng(seed)
+    parts, spans, position = [], [], 0
+    for _ in range(count):
+        silence = np.zeros(int(silence_s * RATE), dtype=np.float32)
+        speech = (rng.standard_normal(int(speech_s * RATE)) * 0.3).astype(np.float32)
+        parts += [silence, speech]
+        position += len(silence)
+        spans.append((position, position + len(speech)))
+        position += len(speech)
+    parts.append(np.zeros(int(silence_s * RATE), dtype=np.float32))
+    return np.concatenate(parts), spans
+
+
+def test_speech_segments_cut_at_long_silences():
+    samples, spans = bursts()
+    segments = yt_audio.speech_segments(samples, RATE)
+    assert len(segments) == len(spans)
+    for (start, end), (speech_start, speech_end) in zip(segments, spans):
+        assert start <= speech_start and end >= speech_end
+        assert end - start < (speech_end - speech_start) + 2 * RATE
+
+
+def test_speech_segments_never_exceed_max_length():
+    samples, _ = bursts(count=1, speech_s=100)
+    segments = yt_audio.speech_segments(samples, RATE, target_s=30, max_s=45)
+    assert len(segments) >= 3
+    assert all(end - start <= 45 * RATE for start, end in segments)
+    assert [b for _, b in segments[:-1]] == [a for a, _ in segments[1:]]
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Simula el servidor de modelos: los tramos se transcriben en este proceso."""
+    state = {"fail_after": None, "calls": []}
+
+    def transcribe_result(audio, model=None, **kwargs):
+        state["calls"].append(len(audio))
+        if state["fail_after"] is not None and len(state["calls"]) > state["fail_after"]:
+            raise RuntimeError("fallo simulado")
+        return {"text": f"tramo de {len(audio)}", "segments": []}
+
+    monkeypatch.setattr(yt_models, "server_available", lambda *args: True)
+    monkeypatch.setattr(yt_models, "transcribe_result", transcribe_result)
+    return state
+
+
+def test_resume_only_transcribes_missing_segments(tmp_path, fake_server):
+    samples, spans = bursts()
+    progress_path = str(tmp_path / "audio.segments.jsonl")
+    fake_server["fail_after"] = 3
+    with pytest.raises(RuntimeError):
+        yt_transcribe.transcribe_parallel(samples, sample_rate=RATE, progress_path=progress_path)
+    assert len(yt_transcribe.load_progress(progress_path)) == 3
+
+    fake_server["fail_after"] = None
+    fake_server["calls"].clear()
+    partial_path = str(tmp_path / "audio.partial.md")
+    result = yt_transcribe.transcribe_parallel(
+        samples, sample_rate=RATE, progress_path=progress_path, partial_path=partial_path
+    )
+    assert len(fake_server["calls"]) == len(spans) - 3
+    assert len(result["segments"]) == len(spans)
+    assert [s["start"] for s in result["segments"]] == sorted(s["start"] for s in result["segments"])
+    with open(partial_path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 2 + len(spans)
+
+
+def test_server_segments_are_sent_one_at_a_time(fake_server, monkeypatch):
+    created = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            created.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(yt_transcribe, "ThreadPoolExecutor", RecordingPool)
+    samples, _ = bursts()
+    yt_transcribe.transcribe_parallel(samples, workers=4, sample_rate=RATE)
+    assert created == [1]
+
+
+def test_process_pool_splits_cpu_threads_between_workers(monkeypatch):
+    created = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers=None, initializer=None, initargs=()):
+            created.append((max_workers, initializer, initargs))
+            super().__init__(max_workers)
+
+    monkeypatch.setattr(yt_models, "server_available", lambda *args: False)
+    monkeypatch.setattr(yt_models, "transcribe_result", lambda audio, model=None: {"text": "x", "segments": []})
+    monkeypatch.setattr(yt_transcribe, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(yt_transcribe.os, "cpu_count", lambda: 8)
+    samples, _ = bursts()
+    yt_transcribe.transcribe_parallel(samples, workers=2, sample_rate=RATE)
+    assert created == [(2, yt_transcribe._init_worker, (4,))]
+
+
+# --- Respaldo de SpeechRecognition por ventanas ---
+
+WAV_RATE = 100  # Muestras por segundo del WAV de prueba
+
+
+class SecondsRecognizer:
+    """Reconocedor local: cada segundo de audio codifica su número en la amplitud."""
+
+    def recognize(self, frames, sample_rate, sample_width):
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float64) / 32767
+        seconds = samples[: len(samples) // sample_rate * sample_rate].reshape(-1, sample_rate).mean(axis=1)
+        return " ".join(f"s{round(value * 100)}" for value in seconds)
+
+
+def test_streaming_fallback_merges_overlapping_windows(tmp_path):
+    samples = np.repeat(np.arange(25, dtype=np.float32) / 100 + 0.001, WAV_RATE)
+    wav_path = yt_audio.write_wav(samples, str(tmp_path / "audio.wav"), sample_rate=WAV_RATE)
+
+    text, errors = yt_transcribe.transcribe_wav_streaming(
+        wav_path, SecondsRecognizer(), window_s=10, overlap_s=2, workers=2
+    )
+    assert errors == []
+    assert text == " ".join(f"s{second}" for second in range(25))
@@ -0,0 +1,58 @@
+from yt_translate import SentenceTranslator, TranslationMemo, make_batches, split_long
+
+
+class UpperBackend:
+    name = "upper"
+
+    def __init__(self, drop_lines=False):
+        self.batches = []
+        self.drop_lines = drop_lines
+
+    def translate_batch(self, sentences, dest):
+        self.batches.append(list(sentences))
+        translated = [sentence.upper() for sentence in sentences]
+        if self.drop_lines and len(translated) > 1:
+            translated.pop()
+        return translated
+
+
+def test_translator_sends_each_new_sentence_once():
+    memo = TranslationMemo(":memory:")
+    backend = UpperBackend()
+    translator = SentenceTranslator(backend, memo, max_chars=20)
+
+    text = "Hola mundo. Hola mundo. Adiós, amigo. Otra frase más."
+    assert translator.translate(text) == "HOLA MUNDO. HOLA MUNDO. ADIÓS, AMIGO. OTRA FRASE MÁS."
+    sent = [sentence for batch in backend.batches for sentence in batch]
+    assert sorted(sent) == sorted({"Hola mundo.", "Adiós, amigo.", "Otra frase más."})
+
+    backend.batches.clear()
+    assert translator.translate("Adiós, amigo. Hola mundo.") == "ADIÓS, AMIGO. HOLA MUNDO."
+    assert backend.batches == []
+    assert translator.counters["memo_hits"] == 2
+
+
+def test_translator_realigns_backends_that_lose_lines():
+    translator = SentenceTranslator(UpperBackend(drop_lines=True), TranslationMemo(":memory:"))
+    assert translator.translate("Uno. Dos. Tres.") == "UNO. DOS. TRES."
+
+
+def test_split_long_cuts_on_whitespace_and_inside_huge_words():
+    assert split_long("corta", 10) == ["corta"]
+    assert split_long("uno dos tres cuatro", 8) == ["uno dos", "tres", "cuatro"]
+    assert split_long("a " + "x" * 12, 5) == ["a", "xxxxx", "xxxxx", "xx"]
+
+
+def test_unpunctuated_transcript_is_batched_within_the_limit_and_kept_in_order():
+    # Una transcripción automática sin puntuación es una sola "frase" enorme
+    words = [f"palabra{i}" for i in range(5000)]
+    text = " ".join(words)
+    batches = make_batches([text], max_chars=4500)
+    assert all(len("\n".join(batch)) <= 4500 for batch in batches)
+    assert " ".join(piece for batch in batches for piece in batch) == text
+
+    backend = UpperBackend()
+    translator = SentenceTranslator(backend, TranslationMemo(":memory:"), max_chars=4500, workers=4)
+    assert translator.translate(text) == text.upper()
+    assert len(backend.batches) > 1
+    assert all(len("\n".join(batch)) <= 4500 for batch in backend.batches)
@@ -0,0 +1,169 @@
+import subprocess
+import tempfile
+import wave
+
+import numpy as np
+
+# Formato que espera Whisper: mono, 16 kHz, float32 en [-1, 1]
+SAMPLE_RATE = 16000
+CHUNK_BYTES = 1 << 20
+
+
+def decode_command(audio_path, sample_rate=SAMPLE_RATE, mp3_path=None):
+    """Orden de ffmpeg que decodifica a PCM float32 por stdout (y opcionalmente escribe un MP3)."""
+    command = ["ffmpeg", "-nostdin", "-v", "error", "-threads", "0", "-i", audio_path]
+    if mp3_path:
+        # Salida secundaria en el mismo proceso: no hace falta volver a decodificar
+        command += ["-map", "0:a:0", "-vn", "-acodec", "libmp3lame", "-ab", "192k", "-y", mp3_path]
+    command += ["-map", "0:a:0", "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-acodec", "pcm_f32le", "-"]
+    return command
+
+
+def decode_audio(audio_path, sample_rate=SAMPLE_RATE, mp3_path=None):
+    """Decodifica cualquier contenedor a un array float32 mono en una sola pasada de ffmpeg.
+
+    El PCM llega por una tubería, sin ficheros intermedios en disco. Los
+    mensajes de error van a un fichero temporal: si fueran a otra tubería,
+    un audio corrupto que llene su búfer bloquearía ffmpeg mientras aquí se
+    espera a stdout.
+    """
+    buffer = bytearray()
+    with tempfile.TemporaryFile() as stderr, subprocess.Popen(
+        decode_command(audio_path, sample_rate, mp3_path), stdout=subprocess.PIPE, stderr=stderr
+    ) as process:
+        while True:
+            chunk = process.stdout.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            buffer += chunk
+        process.wait()
+        stderr.seek(0)
+        errors = stderr.read().decode(errors="replace").strip().splitlines()
+    if process.returncode != 0:
+        # Un fichero corrupto puede generar miles de líneas; bastan las últimas
+        raise RuntimeError("ffmpeg no pudo decodificar el audio: " + "\n".join(errors[-10:]))
+    usable = len(buffer) - len(buffer) % 4
+    return np.frombuffer(memoryview(buffer)[:usable], dtype=np.float32)
+
+
+def to_pcm16(samples):
+    """Convierte muestras float32 a bytes PCM de 16 bits."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def write_wav(samples, wav_path, sample_rate=SAMPLE_RATE):
+    """Guarda un array float32 como WAV PCM de 16 bits (para herramientas que necesitan fichero)."""
+    with wave.open(wav_path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(to_pcm16(samples))
+    return wav_path
+
+
+def duration(samples, sample_rate=SAMPLE_RATE):
+    """Duración en segundos de un array de muestras."""
+    return len(samples) / sample_rate
+
+
+def speech_segments(
+    samples, sample_rate=SAMPLE_RATE, target_s=30, max_s=45, frame_ms=30, min_silence_ms=300, long_silence_ms=2000
+):
+    """Divide el audio en tramos de voz cortando en los silencios (VAD por energía).
+
+    Cada tramo dura como mínimo ``target_s`` (salvo que lo interrumpa un
+    silencio largo) y nunca más de ``max_s``: se corta en un silencio de al
+    menos ``min_silence_ms``, y solo a la fuerza si no hay ninguno. Los
+    silencios de más de ``long_silence_ms`` se eliminan. Devuelve pares
+    (inicio, fin) en muestras.
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame
+    if count == 0:
+        return [(0, len(samples))] if len(samples) else []
+    frames = samples[: count * frame].reshape(count, frame).astype(np.float32)
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+    # Umbral relativo al ruido de fondo, pero nunca cerca del nivel de la voz
+    floor, loud = np.percentile(energy, [10, 90])
+    threshold = max(min(float(floor) * 3, float(loud) * 0.1), 1e-4)
+    silent = np.concatenate(([0], (energy < threshold).astype(np.int8), [0]))
+
+    # Rachas de silencio: las cortas son puntos de corte opcionales (en su
+    # centro); las largas se recortan dejando un margen alrededor de la voz
+    edges = np.flatnonzero(np.diff(silent))
+    min_frames = max(1, min_silence_ms // frame_ms)
+    long_frames = max(min_frames, long_silence_ms // frame_ms)
+    cuts = []  # (posición, obligatorio)
+    for s, e in zip(edges[::2], edges[1::2]):
+        if e - s >= long_frames:
+            pad = min_frames // 2
+            cuts += [((s + pad) * frame, True), ((e - pad) * frame, True)]
+        elif e - s >= min_frames:
+            cuts.append(((s + e) // 2 * frame, False))
+    cuts.append((len(samples), True))
+
+    target, limit = int(target_s * sample_rate), int(max_s * sample_rate)
+    bounds = []
+    start, last = 0, None
+    for cut, forced in cuts:
+        while cut - start > limit:
+            end = last if last is not None and last > start else start + limit
+            bounds.append((start, end))
+            start, last = end, None
+        if forced or cut - start >= target:
+            if cut > start:
+                bounds.append((start, cut))
+            start, last = cut, None
+        else:
+            last = cut
+
+    voiced = lambda a, b: energy[a // frame: max(a // frame + 1, b // frame)].max() >= threshold
+    return [(int(a), int(b)) for a, b in bounds if voiced(a, b)]
+
+
+def downmix(frames, width, channels):
+    """Mezcla a mono bytes PCM intercalados, conservando el ancho de muestra.
+
+    Admite los anchos de WAV habituales: 8 bits (sin signo), 16, 24 y 32 bits.
+    """
+    if width == 1:
+        samples = np.frombuffer(frames, dtype=np.uint8).astype(np.int16) - 128
+    elif width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        samples = np.where(samples & 0x800000, samples - (1 << 24), samples)
+    elif width in (2, 4):
+        samples = np.frombuffer(frames, dtype=f"<i{width}")
+    else:
+        raise ValueError(f"Ancho de muestra no admitido en el WAV: {width} bytes")
+    mono = np.round(samples.reshape(-1, channels).mean(axis=1))
+    if width == 1:
+        return (mono + 128).astype(np.uint8).tobytes()
+    if width == 3:
+        return mono.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    return mono.astype(f"<i{width}").tobytes()
+
+
+def iter_wav_windows(wav_path, window_s=30, overlap_s=2):
+    """Lee un WAV por ventanas de ``window_s`` segundos que se solapan ``overlap_s``.
+
+    Devuelve (índice, inicio en segundos, bytes PCM, frecuencia, bytes por
+    muestra). Nunca hay más de una ventana leída a la vez, sea cual sea la
+    duración del fichero.
+    """
+    with wave.open(wav_path, "rb") as wav_file:
+        rate, width, channels = wav_file.getframerate(), wav_file.getsampwidth(), wav_file.getnchannels()
+        window, step = int(window_s * rate), int((window_s - overlap_s) * rate)
+        if step <= 0:
+            raise ValueError("El solapamiento debe ser menor que la ventana")
+        total = wav_file.getnframes()
+        index, start = 0, 0
+        while start < total:
+            wav_file.setpos(start)
+            frames = wav_file.readframes(window)
+            if channels > 1:
+                frames = downmix(frames, width, channels)
+            yield index, start / rate, frames, rate, width
+            if start + window >= total:
+                break
+            index, start = index + 1, start + step
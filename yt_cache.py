@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+# Directorio de artefactos del script de transcripción (audio, transcripciones, traducciones...)
+CACHE_DIR = os.environ.get("YT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "yt_pipeline"))
+MAX_BYTES = int(os.environ.get("YT_CACHE_MAX_BYTES", 5 * 1024 ** 3))
+
+
+def artifact_key(stage, **params):
+    """Clave de un artefacto: hash de la etapa y de todos los parámetros que lo determinan."""
+    payload = json.dumps([stage, params], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """Caché de artefactos direccionada por contenido, con límite de tamaño.
+
+    Cada artefacto se guarda como fichero en ``objects/ab/<clave>.<ext>`` y un
+    índice SQLite lleva su tamaño y último uso; al superar ``max_bytes`` se
+    borran los usados hace más tiempo. Con ``force`` las búsquedas fallan
+    siempre (se recalcula todo), pero los resultados nuevos se guardan.
+    """
+
+    def __init__(self, root=None, max_bytes=MAX_BYTES, force=False):
+        self.root = root or CACHE_DIR
+        self.max_bytes = max_bytes
+        self.force = force
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._counters = {"hits": 0, "misses": 0, "stored": 0, "evictions": 0}
+
+    def _db(self):
+        # Una conexión por proceso: la caché también se usa desde procesos de trabajo
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(os.path.join(self.root, "index.sqlite3"), check_same_thread=False, timeout=30)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS artifacts (
+                    key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON artifacts(accessed_at)")
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def _object_path(self, key, ext):
+        return os.path.join(self.root, "objects", key[:2], f"{key}{ext}")
+
+    def get_file(self, key):
+        """Devuelve la ruta del artefacto guardado, o None si no está (o con ``force``)."""
+        if self.force:
+            self._counters["misses"] += 1
+            return None
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT path FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row is None or not os.path.exists(row[0]):
+                self._counters["misses"] += 1
+                return None
+            db.execute("UPDATE artifacts SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+        self._counters["hits"] += 1
+        return row[0]
+
+    def put_file(self, key, source_path, stage="", move=False):
+        """Guarda un fichero como artefacto y devuelve su ruta dentro de la caché."""
+        path = self._object_path(key, os.path.splitext(source_path)[1])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if move:
+            shutil.move(source_path, tmp_path)
+        else:
+            shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, path)
+        self._index(key, stage, path)
+        return path
+
+    def _index(self, key, stage, path):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+                (key, stage, path, os.path.getsize(path), now, now),
+            )
+            self._counters["stored"] += 1
+            self._evict(db, keep=key)
+            db.commit()
+
+    def _evict(self, db, keep=None):
+        # Borra los artefactos usados hace más tiempo hasta respetar max_bytes
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, path, size in db.execute("SELECT key, path, size FROM artifacts ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            db.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            if os.path.exists(path):
+                os.remove(path)
+            total -= size
+            self._counters["evictions"] += 1
+
+    def get_text(self, key):
+        path = self.get_file(key)
+        if path is None:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def put_text(self, key, text, stage=""):
+        path = self._object_path(key, ".txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        self._index(key, stage, path)
+        return path
+
+    def get_json(self, key):
+        text = self.get_text(key)
+        return None if text is None else json.loads(text)
+
+    def put_json(self, key, value, stage=""):
+        return self.put_text(key, json.dumps(value, ensure_ascii=False), stage)
+
+    def text(self, stage, params, compute, valid=lambda text: True):
+        """Devuelve el texto guardado para (etapa, parámetros) o lo calcula y lo guarda.
+
+        Solo se guardan los resultados que pasan ``valid`` (p. ej. no los mensajes de error).
+        """
+        key = artifact_key(stage, **params)
+        text = self.get_text(key)
+        if text is not None:
+            print(f"({stage}: usando el resultado guardado)")
+            return text
+        text = compute()
+        if valid(text):
+            self.put_text(key, text, stage)
+        return text
+
+    def invalidate(self, key=None):
+        """Elimina un artefacto, o todos si no se indica."""
+        with self._lock:
+            db = self._db()
+            rows = db.execute(
+                "SELECT key, path FROM artifacts" + ("" if key is None else " WHERE key = ?"),
+                () if key is None else (key,),
+            ).fetchall()
+            for row_key, path in rows:
+                db.execute("DELETE FROM artifacts WHERE key = ?", (row_key,))
+                if os.path.exists(path):
+                    os.remove(path)
+            db.commit()
+
+    def stats(self):
+        """Contadores de uso y tamaño por etapa."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT stage, COUNT(*), COALESCE(SUM(size), 0) FROM artifacts GROUP BY stage"
+            ).fetchall()
+        stats = dict(self._counters)
+        stats.update(
+            stages={stage: {"entries": count, "bytes": size} for stage, count, size in rows},
+            bytes=sum(size for _, _, size in rows),
+            max_bytes=self.max_bytes,
+        )
+        return stats
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Devuelve la caché compartida del proceso; YT_CACHE_FORCE=1 activa ``force``."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ArtifactCache(force=os.environ.get("YT_CACHE_FORCE") == "1")
+        return _default_cache
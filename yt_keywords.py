@@ -0,0 +1,177 @@
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+import yt_cache
+
+# Las notas se escriben en español; se descartan también las palabras vacías en inglés
+SPANISH_STOP_WORDS = frozenset(
+    """
+    algo algunas algunos ante antes aquel aquella aquello aquí así aunque bien cada como con contra cual
+    cuales cuando cómo del desde donde dos durante ella ellas ellos entonces entre era eran eres esa esas
+    ese eso esos esta estaba estado estamos estan están estar este esto estos estoy fue fueron gran había
+    habían hace hacer hacia hasta hay las les los mas más mucho muchos muy nada nos nosotros nuestra
+    nuestro otra otras otro otros para pero poco por porque pues que qué quien quienes sea ser sido sin
+    sobre son soy sus también tan tanto tener tengo tiene tienen toda todas todo todos tras tus una unas
+    uno unos usted ustedes vamos van ver vez voy yo
+    """.split()
+)
+STOP_WORDS = ENGLISH_STOP_WORDS | SPANISH_STOP_WORDS
+
+_WORD = re.compile(r"[^\W\d_]{3,}")
+
+INDEX_PATH = os.path.join(yt_cache.CACHE_DIR, "keywords.sqlite3")
+
+
+def tokenize(text):
+    """Palabras en minúsculas de al menos tres letras, sin palabras vacías."""
+    return [word for word in _WORD.findall(text.lower()) if word not in STOP_WORDS]
+
+
+class KeywordIndex:
+    """Índice persistente de frecuencias de documento para TF-IDF incremental.
+
+    Guarda cuántos documentos contienen cada término. Añadir un documento
+    solo actualiza sus propios términos, y extraer palabras clave consulta
+    la frecuencia de los términos del texto: ni se reajusta un modelo ni el
+    coste crece con el tamaño del corpus.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS df (term TEXT PRIMARY KEY, count INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                terms TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def document_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def _remove(self, doc_id):
+        row = self._conn.execute("SELECT terms FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return
+        self._conn.executemany("UPDATE df SET count = count - 1 WHERE term = ?", ((t,) for t in json.loads(row[0])))
+        self._conn.execute("DELETE FROM df WHERE count <= 0")
+        self._conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+
+    def add_document(self, doc_id, text, mtime=0.0):
+        """Añade o actualiza un documento; devuelve False si ya estaba igual."""
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        terms = sorted(set(tokenize(text)))
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row is not None and row[0] == digest:
+                self._conn.execute("UPDATE docs SET mtime = ? WHERE doc_id = ?", (mtime, doc_id))
+                self._conn.commit()
+                return False
+            self._remove(doc_id)
+            self._conn.executemany(
+                "INSERT INTO df VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET count = count + 1",
+                ((t,) for t in terms),
+            )
+            self._conn.execute(
+                "INSERT INTO docs VALUES (?, ?, ?, ?)", (doc_id, digest, mtime, json.dumps(terms, ensure_ascii=False))
+            )
+            self._conn.commit()
+        return True
+
+    def remove_document(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+            self._conn.commit()
+
+    def add_file(self, path):
+        """Indexa un fichero de texto (si cambió desde la última vez)."""
+        path = os.path.abspath(path)
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return self.add_document(path, f.read(), os.path.getmtime(path))
+
+    def sync(self, folder, extra_files=(), pattern=".md", skip=(".partial.md",)):
+        """Pone el índice al día con las notas de ``folder`` y los ficheros extra.
+
+        Solo se leen los ficheros nuevos o modificados (por fecha); los que ya
+        no existen se quitan del índice. Devuelve cuántos se actualizaron.
+        """
+        paths = {}
+        if os.path.isdir(folder):
+            for entry in os.scandir(folder):
+                if entry.is_file() and entry.name.endswith(pattern) and not entry.name.endswith(skip):
+                    paths[os.path.abspath(entry.path)] = entry.stat().st_mtime
+        extra_files = {os.path.abspath(path) for path in extra_files}
+        for path in extra_files:
+            if os.path.isfile(path):
+                paths[os.path.abspath(path)] = os.path.getmtime(path)
+
+        with self._lock:
+            indexed = dict(self._conn.execute("SELECT doc_id, mtime FROM docs").fetchall())
+        updated = 0
+        for path, mtime in paths.items():
+            if indexed.get(path) != mtime:
+                updated += self.add_file(path)
+        for doc_id in indexed:
+            if doc_id not in paths and (doc_id.startswith(os.path.abspath(folder) + os.sep) or doc_id in extra_files):
+                self.remove_document(doc_id)
+                updated += 1
+        return updated
+
+    def keywords(self, text, num_keywords=10):
+        """Palabras clave de un texto por TF-IDF frente al corpus indexado.
+
+        El texto cuenta como un documento más del corpus (como al ajustar un
+        TfidfVectorizer con él incluido), aunque no se añade al índice.
+        """
+        counts = Counter(tokenize(text))
+        if not counts:
+            return []
+        terms = list(counts)
+        df = {}
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0] + 1
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                df.update(
+                    self._conn.execute(
+                        f"SELECT term, count FROM df WHERE term IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                )
+        # idf suavizado, igual que scikit-learn: log((1 + n) / (1 + df)) + 1
+        scores = {
+            term: count * (math.log((1 + total) / (1 + df.get(term, 0) + 1)) + 1) for term, count in counts.items()
+        }
+        return sorted(scores, key=lambda term: (-scores[term], term))[:num_keywords]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def default_index():
+    """Devuelve el índice compartido del proceso, abriéndolo la primera vez."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = KeywordIndex()
+        return _default_index
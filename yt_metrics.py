@@ -0,0 +1,193 @@
+import functools
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SAMPLE_INTERVAL = 0.05
+
+_local = threading.local()
+
+
+def _rss_bytes():
+    # Memoria residente actual del proceso y de sus hijos (ffmpeg, procesos de trabajo)
+    if psutil is not None:
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _cpu_seconds():
+    # CPU de todo el proceso más la de los hijos ya terminados
+    cpu = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += children.ru_utime + children.ru_stime
+    return cpu
+
+
+class _PeakSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = _rss_bytes()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+@contextmanager
+def collect():
+    """Recoge en una lista las mediciones hechas en este hilo dentro del bloque."""
+    previous = getattr(_local, "records", None)
+    records = []
+    _local.records = records
+    try:
+        yield records
+    finally:
+        _local.records = previous
+
+
+@contextmanager
+def measure(name):
+    """Mide tiempo real, CPU, pico de memoria y bytes de una etapa.
+
+    El diccionario que se entrega admite ``bytes_in``/``bytes_out``. La CPU
+    es la de todo el proceso (más los hijos terminados, como ffmpeg), así que
+    con etapas simultáneas en el mismo proceso es aproximada.
+    """
+    record = {"stage": name, "bytes_in": None, "bytes_out": None, "ok": True}
+    sampler = _PeakSampler()
+    sampler.start()
+    wall, cpu = time.perf_counter(), _cpu_seconds()
+    try:
+        yield record
+    except BaseException:
+        record["ok"] = False
+        raise
+    finally:
+        record["wall_s"] = round(time.perf_counter() - wall, 4)
+        record["cpu_s"] = round(_cpu_seconds() - cpu, 4)
+        sampler.stop()
+        record["peak_rss_mb"] = round(sampler.peak / 1024 ** 2, 1)
+        records = getattr(_local, "records", None)
+        if records is not None:
+            records.append(record)
+
+
+def instrumented(name, bytes_in=None, bytes_out=None):
+    """Decorador que mide cada llamada; ``bytes_in(*args)`` y ``bytes_out(resultado)`` son opcionales."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(name) as record:
+                if bytes_in:
+                    record["bytes_in"] = bytes_in(*args, **kwargs)
+                result = func(*args, **kwargs)
+                if bytes_out:
+                    record["bytes_out"] = bytes_out(result)
+            return result
+        return wrapper
+    return decorator
+
+
+# --- Tamaños para bytes_in/bytes_out ---
+def file_size(path, *args, **kwargs):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return None
+
+
+def text_size(text, *args, **kwargs):
+    return len(text.encode("utf-8")) if isinstance(text, str) else None
+
+
+def audio_size(audio, *args, **kwargs):
+    return file_size(audio) if isinstance(audio, str) else getattr(audio, "nbytes", None)
+
+
+# --- Informes ---
+def summarize(records):
+    """Agrega mediciones por etapa: llamadas, totales de tiempo/CPU/bytes y pico de memoria."""
+    stages = {}
+    for record in records:
+        entry = stages.setdefault(
+            record["stage"],
+            {"calls": 0, "failed": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_mb": 0.0, "bytes_in": 0, "bytes_out": 0},
+        )
+        entry["calls"] += 1
+        entry["failed"] += not record["ok"]
+        entry["wall_s"] = round(entry["wall_s"] + record["wall_s"], 4)
+        entry["cpu_s"] = round(entry["cpu_s"] + record["cpu_s"], 4)
+        entry["peak_rss_mb"] = max(entry["peak_rss_mb"], record["peak_rss_mb"])
+        entry["bytes_in"] += record["bytes_in"] or 0
+        entry["bytes_out"] += record["bytes_out"] or 0
+    return stages
+
+
+def format_summary(stages):
+    """Tabla de texto con el resumen por etapa."""
+    lines = [f"{'Etapa':<26}{'Llamadas':>9}{'Real s':>10}{'CPU s':>10}{'Pico MB':>10}{'Entrada KB':>12}{'Salida KB':>11}"]
+    for name, entry in sorted(stages.items(), key=lambda item: -item[1]["wall_s"]):
+        lines.append(
+            f"{name:<26}{entry['calls']:>9}{entry['wall_s']:>10.2f}{entry['cpu_s']:>10.2f}{entry['peak_rss_mb']:>10.1f}"
+            f"{entry['bytes_in'] / 1024:>12.1f}{entry['bytes_out'] / 1024:>11.1f}"
+        )
+    return "\n".join(lines)
+
+
+def write_report(path, records, **extra):
+    """Guarda las mediciones y su resumen en JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(extra, stages=summarize(records), records=records), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_reports(folder):
+    """Lee las mediciones de todos los ``*.metrics.json`` de una carpeta."""
+    records = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.metrics.json"))):
+        with open(path, encoding="utf-8") as f:
+            records += json.load(f).get("records", [])
+    return records
+
+
+if __name__ == "__main__":
+    # Informe agregado de todas las ejecuciones guardadas: python yt_metrics.py [carpeta]
+    folder = sys.argv[1] if len(sys.argv) > 1 else "output"
+    records = load_reports(folder)
+    print(f"{len(records)} mediciones en {folder}\n")
+    print(format_summary(summarize(records)))
@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+from contextlib import contextmanager
+
+import yt_summarize
+
+# Modelos por defecto del script de transcripción
+WHISPER_MODEL = "base"
+SUMMARY_MODEL = "sshleifer/distilbart-cnn-12-6"
+
+# Socket del servidor de modelos (si existe, los scripts le envían los trabajos)
+SOCKET_PATH = os.environ.get("YT_MODEL_SOCKET", os.path.join(os.path.expanduser("~"), ".cache", "yt_models.sock"))
+
+
+def _load_whisper(name):
+    import whisper
+    return whisper.load_model(name)
+
+
+def _load_summarizer(name):
+    from transformers import pipeline
+    return pipeline("summarization", model=name)
+
+
+class ModelRegistry:
+    """Carga cada modelo una sola vez y lo mantiene en memoria.
+
+    Los modelos se identifican por (tipo, nombre). Si varios hilos piden el
+    mismo modelo a la vez, solo uno lo carga y el resto espera. Para
+    ejecutarlo hay que usar ``use``, que presta cada instancia a un solo
+    hilo a la vez.
+    """
+
+    LOADERS = {"whisper": _load_whisper, "summarizer": _load_summarizer}
+
+    def __init__(self, loaders=None):
+        self.loaders = dict(self.LOADERS, **(loaders or {}))
+        self._models = {}
+        self._locks = {}
+        self._busy = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind, name):
+        key = (kind, name)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._models:
+                self._models[key] = self.loaders[kind](name)
+            return self._models[key]
+
+    @contextmanager
+    def use(self, kind, name):
+        """Presta el modelo en exclusiva mientras dura el bloque ``with``.
+
+        Una instancia no admite inferencias simultáneas: Whisper, por ejemplo,
+        instala en sus módulos los ganchos de la caché kv de cada decodificación,
+        y dos decodificaciones a la vez mezclarían sus cachés.
+        """
+        model = self.get(kind, name)
+        with self._lock:
+            busy = self._busy.setdefault((kind, name), threading.Lock())
+        with busy:
+            yield model
+
+    def whisper(self, name=WHISPER_MODEL):
+        return self.get("whisper", name)
+
+    def summarizer(self, name=SUMMARY_MODEL):
+        return self.get("summarizer", name)
+
+    def loaded(self):
+        """Lista de modelos ya cargados como [tipo, nombre]."""
+        return [list(key) for key in self._models]
+
+    def unload(self, kind=None, name=None):
+        """Libera los modelos indicados (o todos)."""
+        with self._lock:
+            for key in list(self._models):
+                if (kind is None or key[0] == kind) and (name is None or key[1] == name):
+                    del self._models[key]
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def default_registry():
+    """Devuelve el registro compartido del proceso, creándolo la primera vez."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
+
+
+# --- Trabajos ---
+def _set_threads(threads):
+    # Hilos de CPU que usa PyTorch en este proceso
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+
+def run_job(job, registry=None):
+    """Ejecuta un trabajo ({"op": ..., ...}) con los modelos del registro."""
+    registry = registry or default_registry()
+    op = job.get("op")
+    _set_threads(job.get("threads"))
+    if op == "transcribe":
+        audio = job["audio"] if "audio" in job else job["path"]
+        with registry.use("whisper", job.get("model", WHISPER_MODEL)) as model:
+            result = model.transcribe(audio, **job.get("kwargs", {}))
+        segments = [
+            {"start": segment["start"], "end": segment["end"], "text": segment["text"]}
+            for segment in result.get("segments", [])
+        ]
+        return {"text": result["text"], "segments": segments, "language": result.get("language")}
+    if op == "summarize_long":
+        with registry.use("summarizer", job.get("model", SUMMARY_MODEL)) as summarizer:
+            return {"summary": yt_summarize.summarize_long(summarizer, job["text"], **job.get("kwargs", {}))}
+    if op == "status":
+        return {"loaded": registry.loaded(), "pid": os.getpid()}
+    if op == "unload":
+        registry.unload(job.get("kind"), job.get("model"))
+        return {"loaded": registry.loaded()}
+    raise ValueError(f"Operación desconocida: {op}")
+
+
+# --- Servidor (una petición JSON por línea, una respuesta JSON por línea) ---
+# Si la petición lleva "pcm_bytes", justo detrás van esos bytes de audio float32
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                job = json.loads(line)
+                if "pcm_bytes" in job:
+                    import numpy as np
+                    job["audio"] = np.frombuffer(self.rfile.read(job.pop("pcm_bytes")), dtype=np.float32)
+                reply = {"ok": True, "result": run_job(job, self.server.registry)}
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor local que mantiene los modelos cargados entre trabajos."""
+
+    daemon_threads = True
+
+    def __init__(self, path=SOCKET_PATH, registry=None):
+        if os.path.exists(path):
+            os.unlink(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        super().__init__(path, _JobHandler)
+        self.registry = registry or default_registry()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def server_available(path=SOCKET_PATH):
+    """Indica si hay un servidor de modelos escuchando en el socket."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def submit(job, path=SOCKET_PATH, timeout=None, payload=None):
+    """Envía un trabajo (y opcionalmente bytes de audio) al servidor y devuelve su resultado."""
+    if payload is not None:
+        job = dict(job, pcm_bytes=len(payload))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        with sock.makefile("rwb") as stream:
+            stream.write((json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8"))
+            if payload is not None:
+                stream.write(payload)
+            stream.flush()
+            reply = json.loads(stream.readline())
+    if not reply["ok"]:
+        raise RuntimeError(reply["error"])
+    return reply["result"]
+
+
+def transcribe_result(audio, model=WHISPER_MODEL, **kwargs):
+    """Transcribe una ruta o un array float32 de 16 kHz; devuelve texto, segmentos e idioma.
+
+    Usa el servidor si está en marcha; si no, el registro local.
+    """
+    job = {"op": "transcribe", "model": model, "kwargs": kwargs}
+    if isinstance(audio, str):
+        if server_available():
+            return submit(dict(job, path=os.path.abspath(audio)))
+        return run_job(dict(job, path=audio))
+    if server_available():
+        return submit(job, payload=audio.astype("float32").tobytes())
+    return run_job(dict(job, audio=audio))
+
+
+def transcribe(audio, model=WHISPER_MODEL, **kwargs):
+    """Como ``transcribe_result`` pero devuelve solo el texto."""
+    return transcribe_result(audio, model, **kwargs)["text"]
+
+
+def summarize_long(text, model=SUMMARY_MODEL, threads=None, **kwargs):
+    """Resume un texto largo por map-reduce (ver ``yt_summarize.summarize_long``)."""
+    job = {"op": "summarize_long", "text": text, "model": model, "threads": threads, "kwargs": kwargs}
+    if server_available():
+        return submit(job)["summary"]
+    return run_job(job)["summary"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local de modelos (Whisper y resumen) siempre cargados.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="ruta del socket Unix")
+    parser.add_argument("--whisper", default=WHISPER_MODEL, help="modelo de Whisper a precargar")
+    parser.add_argument("--summarizer", default=SUMMARY_MODEL, help="modelo de resumen a precargar")
+    parser.add_argument("--no-preload", action="store_true", help="cargar los modelos con el primer trabajo")
+    args = parser.parse_args()
+
+    registry = default_registry()
+    if not args.no_preload:
+        print("Cargando modelos...")
+        registry.whisper(args.whisper)
+        registry.summarizer(args.summarizer)
+    with ModelServer(args.socket, registry) as server:
+        print(f"Servidor de modelos escuchando en {args.socket}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
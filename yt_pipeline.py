@@ -0,0 +1,148 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class Stage:
+    """Etapa del pipeline: ``func(valor) -> valor`` ejecutada en hilos o en procesos.
+
+    Las funciones de etapas en procesos deben poder serializarse con pickle
+    (definidas a nivel de módulo), igual que sus argumentos y resultados.
+    """
+
+    def __init__(self, name, func, workers=1, processes=False):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.processes = processes
+
+    def executor(self):
+        pool = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        return pool(max_workers=self.workers)
+
+
+class Item:
+    """Un elemento que atraviesa el pipeline, con sus tiempos por etapa y su error."""
+
+    def __init__(self, index, source):
+        self.index = index
+        self.source = source
+        self.value = source
+        self.error = None
+        self.failed_stage = None
+        self.timings = {}
+        self.started = None
+        self.finished = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+
+
+class Pipeline:
+    """Encadena etapas con colas acotadas para que todas trabajen a la vez.
+
+    Mientras una etapa procesa un elemento, la anterior ya avanza con el
+    siguiente. Las colas acotadas impiden que una etapa rápida (p. ej. la
+    descarga) acumule trabajo sin límite delante de una lenta. Si un elemento
+    falla en una etapa, se marca y sale del pipeline sin afectar al resto.
+    """
+
+    def __init__(self, stages, queue_size=2, on_done=None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_done = on_done
+        self.busy = {stage.name: 0.0 for stage in stages}
+        self.wall = 0.0
+
+    async def _worker(self, stage, executor, inbox, outbox):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await inbox.get()
+            if item is None:
+                inbox.task_done()
+                return
+            if not item.ok:
+                # Un elemento que ya falló atraviesa el resto de etapas sin trabajo
+                await outbox.put(item)
+                inbox.task_done()
+                continue
+            started = time.perf_counter()
+            try:
+                item.value = await loop.run_in_executor(executor, stage.func, item.value)
+            except Exception as e:
+                item.error = e
+                item.failed_stage = stage.name
+            elapsed = time.perf_counter() - started
+            item.timings[stage.name] = elapsed
+            self.busy[stage.name] += elapsed
+            await outbox.put(item)
+            inbox.task_done()
+
+    async def _collect(self, inbox, results):
+        while True:
+            item = await inbox.get()
+            if item is None:
+                return
+            item.finished = time.perf_counter()
+            results.append(item)
+            if self.on_done:
+                self.on_done(item)
+
+    async def _run(self, sources):
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        executors = [stage.executor() for stage in self.stages]
+        results = []
+        started = time.perf_counter()
+        try:
+            collector = asyncio.create_task(self._collect(queues[-1], results))
+            workers = [
+                [
+                    asyncio.create_task(self._worker(stage, executor, queues[i], queues[i + 1]))
+                    for _ in range(stage.workers)
+                ]
+                for i, (stage, executor) in enumerate(zip(self.stages, executors))
+            ]
+            for index, source in enumerate(sources):
+                item = Item(index, source)
+                item.started = time.perf_counter()
+                await queues[0].put(item)
+            # Cierre en orden: cada etapa termina antes de avisar a la siguiente
+            for i, stage_workers in enumerate(workers):
+                for _ in stage_workers:
+                    await queues[i].put(None)
+                await asyncio.gather(*stage_workers)
+            await queues[-1].put(None)
+            await collector
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+        self.wall = time.perf_counter() - started
+        return sorted(results, key=lambda item: item.index)
+
+    def run(self, sources):
+        """Procesa todas las fuentes y devuelve los ``Item`` en el orden de entrada."""
+        return asyncio.run(self._run(sources))
+
+    def report(self, items):
+        """Resumen de rendimiento: elementos, tiempo total, ritmo y ocupación de cada etapa."""
+        done = sum(1 for item in items if item.ok)
+        return {
+            "items": len(items),
+            "ok": done,
+            "failed": len(items) - done,
+            "wall_s": round(self.wall, 3),
+            "items_per_hour": round(done / self.wall * 3600, 2) if self.wall else 0.0,
+            "stages": {
+                stage.name: {
+                    "workers": stage.workers,
+                    "busy_s": round(self.busy[stage.name], 3),
+                    "utilization": round(self.busy[stage.name] / (self.wall * stage.workers), 3) if self.wall else 0.0,
+                }
+                for stage in self.stages
+            },
+        }
@@ -0,0 +1,102 @@
+import re
+
+# distilbart admite 1024 tokens de entrada; se deja margen para los tokens especiales
+CHUNK_TOKENS = 900
+BATCH_SIZE = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?¡¿…])\s+")
+
+
+def split_sentences(text):
+    """Divide un texto en frases (por signos de fin de frase)."""
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
+
+
+def split_oversized(sentences, token_ids, decode, chunk_tokens=CHUNK_TOKENS):
+    """Parte las frases de más de ``chunk_tokens`` tokens en ventanas de ese tamaño.
+
+    Un texto sin puntuación (como el del reconocedor de respaldo) es una sola
+    «frase»; sin partirla, el modelo solo vería su principio. ``token_ids``
+    son los IDs de cada frase y ``decode`` los convierte de nuevo en texto.
+    """
+    pieces = []
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) <= chunk_tokens:
+            pieces.append(sentence)
+            continue
+        for start in range(0, len(ids), chunk_tokens):
+            piece = decode(ids[start:start + chunk_tokens]).strip()
+            if piece:
+                pieces.append(piece)
+    return pieces
+
+
+def chunk_by_tokens(sentences, token_counts, chunk_tokens=CHUNK_TOKENS):
+    """Agrupa frases consecutivas en trozos de como mucho ``chunk_tokens`` tokens.
+
+    Una frase que por sí sola supera el límite forma su propio trozo; para
+    evitarlo se pasan antes por ``split_oversized``.
+    """
+    chunks, current, size = [], [], 0
+    for sentence, count in zip(sentences, token_counts):
+        if current and size + count > chunk_tokens:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += count
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _max_length(token_count, max_length):
+    # Un resumen nunca debería ser más largo que su entrada
+    return max(20, min(max_length, token_count // 2 + 20))
+
+
+def summarize_long(
+    summarizer, text, chunk_tokens=CHUNK_TOKENS, batch_size=BATCH_SIZE, max_length=150, min_length=20, max_rounds=4
+):
+    """Resume un texto de cualquier longitud por map-reduce.
+
+    *Map*: el texto se parte en trozos que caben en la ventana del modelo y
+    se resumen por lotes (``batch_size`` trozos en cada pasada del modelo).
+    *Reduce*: los resúmenes se unen y, si aún no caben en una ventana, se
+    repite; al final se resume una vez más el conjunto.
+    """
+    tokenizer = summarizer.tokenizer
+
+    def token_ids(pieces):
+        return tokenizer(pieces, add_special_tokens=False)["input_ids"]
+
+    def count_tokens(pieces):
+        return [len(ids) for ids in token_ids(pieces)]
+
+    def decode(ids):
+        return tokenizer.decode(ids, skip_special_tokens=True)
+
+    def run(pieces, counts):
+        lengths = [_max_length(count, max_length) for count in counts]
+        outputs = summarizer(
+            pieces,
+            batch_size=batch_size,
+            max_length=max(lengths),
+            min_length=min(min_length, min(lengths) - 1),
+            truncation=True,
+            do_sample=False,
+        )
+        return [output["summary_text"].strip() for output in outputs]
+
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    for _ in range(max_rounds):
+        ids = token_ids(sentences)
+        if sum(len(sentence_ids) for sentence_ids in ids) <= chunk_tokens:
+            break
+        sentences = split_oversized(sentences, ids, decode, chunk_tokens)
+        chunks = chunk_by_tokens(sentences, count_tokens(sentences), chunk_tokens)
+        summaries = run(chunks, count_tokens(chunks))
+        sentences = [sentence for summary in summaries for sentence in split_sentences(summary)]
+    final = " ".join(sentences)
+    return run([final], count_tokens([final]))[0]
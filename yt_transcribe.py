@@ -0,0 +1,241 @@
+import importlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import yt_audio
+import yt_models
+
+
+def format_timestamp(seconds):
+    """Convierte segundos a HH:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _transcribe_segment(index, start, audio, model, sample_rate):
+    # Se ejecuta en un proceso de trabajo: cada proceso mantiene su propio modelo cargado
+    result = yt_models.transcribe_result(audio, model)
+    offset = start / sample_rate
+    segments = [
+        {"start": round(offset + s["start"], 2), "end": round(offset + s["end"], 2), "text": s["text"].strip()}
+        for s in result["segments"]
+    ] or [{"start": round(offset, 2), "end": round(offset + len(audio) / sample_rate, 2), "text": result["text"].strip()}]
+    return {
+        "index": index,
+        "start": start,
+        "end": start + len(audio),
+        "text": result["text"].strip(),
+        "segments": segments,
+    }
+
+
+def _init_worker(threads):
+    # Cada proceso usa su parte de los núcleos: N procesos con todos los hilos saturarían la CPU
+    yt_models._set_threads(threads)
+
+
+def load_progress(path):
+    """Lee los tramos ya transcritos de un fichero de progreso JSONL."""
+    done = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # última línea a medio escribir
+                done[entry["index"]] = entry
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class TranscriptWriter:
+    """Escribe la transcripción parcial en orden a medida que terminan los tramos.
+
+    Los tramos que llegan adelantados esperan hasta que estén todos los
+    anteriores, para que el fichero siempre sea un prefijo correcto del texto.
+    """
+
+    def __init__(self, path, title=None):
+        self.path = path
+        self.pending = {}
+        self.next_index = 0
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# {title or 'Transcripción'} (en curso)\n\n")
+
+    def add(self, entry):
+        self.pending[entry["index"]] = entry
+        ready = []
+        while self.next_index in self.pending:
+            ready.append(self.pending.pop(self.next_index))
+            self.next_index += 1
+        if self.path and ready:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for entry in ready:
+                    for segment in entry["segments"]:
+                        f.write(f"[{format_timestamp(segment['start'])}] {segment['text']}\n")
+                f.flush()
+
+
+def transcribe_parallel(
+    samples,
+    model=yt_models.WHISPER_MODEL,
+    workers=None,
+    sample_rate=yt_audio.SAMPLE_RATE,
+    progress_path=None,
+    partial_path=None,
+    title=None,
+    on_segment=None,
+):
+    """Transcribe un audio largo por tramos de voz en varios procesos a la vez.
+
+    El audio se divide en los silencios, cada tramo se transcribe por
+    separado y los resultados se vuelven a unir con las marcas de tiempo
+    corregidas. Cada tramo terminado se guarda en ``progress_path`` (JSONL):
+    si el proceso se interrumpe, la siguiente ejecución solo transcribe los
+    que faltan. ``partial_path`` recibe el texto en orden según avanza.
+
+    Con el servidor de modelos en marcha los tramos se le envían de uno en
+    uno: tiene una sola instancia de cada modelo y la usa en exclusiva. Si
+    no, se usan ``workers`` procesos con su propio modelo y su parte de los
+    núcleos de la CPU.
+    """
+    cpus = os.cpu_count() or 2
+    workers = workers or max(1, cpus // 2)
+    bounds = yt_audio.speech_segments(samples, sample_rate)
+    done = load_progress(progress_path) if progress_path else {}
+    done = {
+        index: entry
+        for index, entry in done.items()
+        if index < len(bounds) and (entry["start"], entry["end"]) == bounds[index]
+    }
+    writer = TranscriptWriter(partial_path, title)
+    results = {}
+    for index in sorted(done):
+        results[index] = done[index]
+        writer.add(done[index])
+
+    todo = [index for index in range(len(bounds)) if index not in done]
+    if yt_models.server_available():
+        workers = 1
+        executor = ThreadPoolExecutor(max_workers=1)
+    else:
+        workers = min(workers, max(1, len(todo)))
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(max(1, cpus // workers),)
+        )
+    progress = open(progress_path, "a", encoding="utf-8") if progress_path else None
+    try:
+        with executor:
+            # Como mucho dos tramos por trabajador en vuelo: la memoria no crece con la duración
+            queue = iter(todo)
+            running = set()
+
+            def submit_next():
+                index = next(queue, None)
+                if index is not None:
+                    start, end = bounds[index]
+                    running.add(executor.submit(_transcribe_segment, index, start, samples[start:end], model, sample_rate))
+
+            for _ in range(workers * 2):
+                submit_next()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    running.discard(future)
+                    entry = future.result()
+                    results[entry["index"]] = entry
+                    if progress:
+                        progress.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                        progress.flush()
+                    writer.add(entry)
+                    if on_segment:
+                        on_segment(entry, len(results), len(bounds))
+                    submit_next()
+    finally:
+        if progress:
+            progress.close()
+
+    ordered = [results[index] for index in range(len(bounds))]
+    return {
+        "text": " ".join(entry["text"] for entry in ordered if entry["text"]),
+        "segments": [segment for entry in ordered for segment in entry["segments"]],
+    }
+
+
+# --- Respaldo con SpeechRecognition por ventanas ---
+class GoogleRecognizer:
+    """Reconocimiento con la API web de Google a través de SpeechRecognition."""
+
+    def __init__(self, language="en-US"):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+        self.language = language
+
+    def recognize(self, frames, sample_rate, sample_width):
+        """Texto de una ventana; "" si no se entiende nada. Los errores de red se propagan."""
+        try:
+            audio = self.sr.AudioData(frames, sample_rate, sample_width)
+            return self.recognizer.recognize_google(audio, language=self.language)
+        except self.sr.UnknownValueError:
+            return ""
+
+
+def load_recognizer(spec=None):
+    """Crea el reconocedor: ``google`` o ``módulo:clase`` (p. ej. un stub local)."""
+    spec = spec or os.environ.get("YT_SR_BACKEND", "google")
+    if spec == "google":
+        return GoogleRecognizer()
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def merge_overlap(previous, words, max_overlap=20):
+    """Quita del principio de ``words`` las palabras repetidas del final de ``previous``."""
+    for size in range(min(max_overlap, len(previous), len(words)), 0, -1):
+        if [w.lower() for w in previous[-size:]] == [w.lower() for w in words[:size]]:
+            return words[size:]
+    return words
+
+
+def transcribe_wav_streaming(wav_path, recognizer=None, window_s=30, overlap_s=2, workers=4):
+    """Reconoce un WAV por ventanas solapadas, con memoria constante.
+
+    Cada ventana se reconoce por separado con como mucho ``workers``
+    peticiones en vuelo (y otras tantas ventanas esperando); los textos se
+    unen en orden quitando las palabras repetidas por el solapamiento.
+    Devuelve (texto, errores): la lista de errores de las ventanas que fallaron.
+    """
+    recognizer = recognizer or load_recognizer()
+    windows = yt_audio.iter_wav_windows(wav_path, window_s, overlap_s)
+    texts, errors = {}, []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+
+        def submit_next():
+            window = next(windows, None)
+            if window is not None:
+                index, start, frames, rate, width = window
+                running[executor.submit(recognizer.recognize, frames, rate, width)] = (index, start)
+
+        for _ in range(workers * 2):
+            submit_next()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, start = running.pop(future)
+                try:
+                    texts[index] = future.result()
+                except Exception as e:
+                    texts[index] = ""
+                    errors.append(f"[{format_timestamp(start)}] {e}")
+                submit_next()
+
+    merged = []
+    for index in sorted(texts):
+        merged += merge_overlap(merged, texts[index].split())
+    return " ".join(merged), errors
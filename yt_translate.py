@@ -0,0 +1,187 @@
+import hashlib
+import importlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import yt_cache
+from yt_summarize import split_sentences
+
+# Límite de caracteres por petición (el traductor web de Google rechaza textos de más de ~5000)
+MAX_CHARS = 4500
+WORKERS = 4
+
+
+class GoogleBackend:
+    """Traducción con googletrans; un solo cliente compartido por todos los hilos."""
+
+    name = "google"
+
+    def __init__(self):
+        from googletrans import Translator
+        self.translator = Translator()
+
+    def translate_batch(self, sentences, dest):
+        # Una petición por lote: las frases van en líneas separadas
+        translated = self.translator.translate("\n".join(sentences), dest=dest).text.split("\n")
+        if len(translated) == len(sentences):
+            return [line.strip() for line in translated]
+        # Si el servicio une o parte líneas, se traduce frase a frase
+        return [result.text for result in self.translator.translate(list(sentences), dest=dest)]
+
+
+def load_backend(spec=None):
+    """Crea el motor de traducción: ``google`` o ``módulo:clase`` (p. ej. un stub local)."""
+    spec = spec or os.environ.get("YT_TRANSLATE_BACKEND", "google")
+    if spec == "google":
+        return GoogleBackend()
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+class TranslationMemo:
+    """Memoria persistente de traducciones por frase (SQLite)."""
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(yt_cache.CACHE_DIR, exist_ok=True)
+            path = os.path.join(yt_cache.CACHE_DIR, "translations.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(backend, dest, sentence):
+        return hashlib.sha1(f"{backend}\0{dest}\0{sentence}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, text FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, items):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?)", items)
+            self._conn.commit()
+
+
+def split_long(sentence, max_chars=MAX_CHARS):
+    """Parte una frase de más de ``max_chars`` caracteres por los espacios.
+
+    Una palabra que por sí sola supera el límite se corta donde caiga.
+    """
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces, current = [], ""
+    for word in sentence.split():
+        while len(word) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def make_batches(sentences, max_chars=MAX_CHARS):
+    """Agrupa frases consecutivas en lotes de como mucho ``max_chars`` caracteres.
+
+    Las frases más largas que el límite (p. ej. una transcripción sin
+    puntuación) se parten antes con ``split_long``.
+    """
+    batches, current, size = [], [], 0
+    for sentence in (piece for sentence in sentences for piece in split_long(sentence, max_chars)):
+        if current and size + len(sentence) + 1 > max_chars:
+            batches.append(current)
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        batches.append(current)
+    return batches
+
+
+class SentenceTranslator:
+    """Traduce textos largos por lotes de frases, en paralelo y con memoria.
+
+    Solo se envían las frases que no están en la memoria (cada frase
+    distinta una vez); el texto se recompone en el orden original. Las
+    frases demasiado largas se traducen por trozos que se vuelven a unir.
+    """
+
+    def __init__(self, backend=None, memo=None, max_chars=MAX_CHARS, workers=WORKERS):
+        self.backend = backend or load_backend()
+        self.memo = memo if memo is not None else TranslationMemo()
+        self.max_chars = max_chars
+        self.workers = workers
+        self.counters = {"sentences": 0, "memo_hits": 0, "requests": 0}
+
+    def _translate_batch(self, batch, dest):
+        # Un motor que une o parte líneas no puede desalinear frase y traducción:
+        # se repite el lote frase a frase y, si aun así falla, se avisa
+        translated = list(self.backend.translate_batch(batch, dest))
+        if len(translated) == len(batch):
+            return translated
+        translated = []
+        for sentence in batch:
+            result = list(self.backend.translate_batch([sentence], dest))
+            if len(result) != 1:
+                raise RuntimeError(
+                    f"El traductor devolvió {len(result)} líneas para una frase: {sentence[:80]!r}"
+                )
+            translated.append(result[0])
+        self.counters["requests"] += len(batch)
+        return translated
+
+    def translate(self, text, dest="es"):
+        sentences = split_sentences(text)
+        name = getattr(self.backend, "name", type(self.backend).__name__)
+        keys = [self.memo.key(name, dest, sentence) for sentence in sentences]
+        known = self.memo.get_many(set(keys))
+        missing = list(dict.fromkeys(s for s, k in zip(sentences, keys) if k not in known))
+        self.counters["sentences"] += len(sentences)
+        self.counters["memo_hits"] += len(sentences) - sum(1 for k in keys if k not in known)
+
+        batches = make_batches(missing, self.max_chars)
+        self.counters["requests"] += len(batches)
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as executor:
+                results = executor.map(lambda batch: self._translate_batch(batch, dest), batches)
+                pieces = {}
+                for batch, translated in zip(batches, results):
+                    pieces.update(zip(batch, translated))
+            items = [
+                (self.memo.key(name, dest, sentence), " ".join(pieces[piece] for piece in split_long(sentence, self.max_chars)))
+                for sentence in missing
+            ]
+            self.memo.put_many(items)
+            known.update(items)
+        return " ".join(known[key] for key in keys)
+
+
+_default_translator = None
+_default_lock = threading.Lock()
+
+
+def default_translator():
+    """Devuelve el traductor compartido del proceso, creándolo la primera vez."""
+    global _default_translator
+    with _default_lock:
+        if _default_translator is None:
+            _default_translator = SentenceTranslator()
+        return _default_translator